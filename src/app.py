@@ -6,6 +6,10 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.exceptions import BookNotFoundError
+from src.profiling import ProfileMiddleware, profiling_enabled
+from src.runtime_metrics import RuntimeMiddleware
+
 DESCRIPTION = """
 Get Bible verses.
 """
@@ -31,6 +35,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(RuntimeMiddleware)
+
+if profiling_enabled():
+    app.add_middleware(ProfileMiddleware)
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
@@ -44,3 +53,15 @@ async def validation_exception_handler(
             {"detail": error["msg"], "loc": error["loc"]}
         ),
     )
+
+
+@app.exception_handler(BookNotFoundError)
+async def book_not_found_exception_handler(
+    request: Request, exc: BookNotFoundError
+):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=jsonable_encoder(
+            {"detail": exc.detail, "suggestions": exc.suggestions}
+        ),
+    )
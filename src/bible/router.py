@@ -2,8 +2,10 @@ import re
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pythonbible.errors import InvalidVerseError
 
+from src.broadcast import daily_verse_broadcaster
 from src.dependencies import (
     validate_random_book,
     validate_random_chapter,
@@ -77,3 +79,14 @@ async def daily_verse(
 ) -> DailyVerseResponse:
     verse = get_daily_verse(bible_version)
     return DailyVerseResponse(**verse.model_dump())  # pyright: ignore[reportAny]
+
+
+@bible_router.get("/daily-verse/stream", response_class=StreamingResponse)
+async def daily_verse_stream(
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> StreamingResponse:
+    return StreamingResponse(
+        daily_verse_broadcaster.subscribe(bible_version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
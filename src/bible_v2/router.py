@@ -1,24 +1,109 @@
+import re
 from typing import Annotated
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import (
+    JSONResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
+from pythonbible import Book, get_book_chapter_verse, get_verse_id
 from pythonbible.errors import InvalidVerseError
 
+from src.constants import CANONICAL_REDIRECT, MAX_PASSAGE_VERSES
 from src.dependencies import (
+    negotiate_format,
     validate_book,
     validate_chapter,
+    validate_fields,
+    validate_passage,
     validate_random_book,
     validate_random_chapter,
-    validate_reference,
+    validate_read_start,
     validate_verse,
 )
-from src.schemas import AcceptedBookGroup, AcceptedVersion, VerseResponse
+from src.concordance import WORD_REGEX, get_concordance, normalize_text
+from src.corpus import iter_ndjson
+from src.encoders import (
+    ResponseFormat,
+    compact_verse_payload,
+    encoded_response,
+    select_fields,
+)
+from src.exceptions import InvalidArgumentsError
+from src.passages import Passage, split_verse_id
+from src.plans import reading_plan
+from src.registry import version_registry
+from src.schemas import (
+    AcceptedBookGroup,
+    AcceptedVersion,
+    ComparedVerse,
+    CompareResponse,
+    ConcordanceResponse,
+    ConcordanceVerse,
+    LocalVersionInfo,
+    PlanBalance,
+    PlanPortion,
+    PlanResponse,
+    ReadResponse,
+    ReadVerse,
+    SuggestResponse,
+    VerseResponse,
+    VersionsResponse,
+)
 from src.service import (
-    get_parsed_verse,
+    check_passage_text,
+    compare_verse_texts,
+    get_passage_text_coalesced,
+    get_passage_verses_coalesced,
+    read_verses,
 )
+from src.suggest import suggest_references
+from src.utils import get_book
+from src.verse_table import CHAPTER_PLACE
 
 router = APIRouter(prefix="/bible", tags=["bible v2"])
 
 
+def canonical_redirect(
+    request: Request, **path_params: str | int
+) -> RedirectResponse | None:
+    """Redirect to the canonical URL of the current route if any of the
+    requested path params differ from their canonical form.
+
+    Args:
+        request (Request): the current request.
+        **path_params (str | int): canonical value of each path param.
+
+    Returns:
+        RedirectResponse | None: 301 redirect, or None if CANONICAL_REDIRECT
+            is off or the URL is already canonical.
+    """
+
+    if not CANONICAL_REDIRECT or all(
+        request.path_params[name] == str(value)
+        for name, value in path_params.items()
+    ):
+        return None
+
+    path = request.app.url_path_for(request.scope["route"].name, **path_params)
+    url = quote(path, safe="/:,;")
+
+    if request.url.query:
+        url = "{}?{}".format(url, request.url.query)
+
+    return RedirectResponse(url, status_code=status.HTTP_301_MOVED_PERMANENTLY)
+
+
 @router.get("/")
 async def v2_root():
     return {"version": "2", "detail": "OK"}
@@ -50,24 +135,368 @@ async def random_verse(
     }
 
 
-@router.get("/{reference}")
-async def get_from_reference(
-    reference: str = Depends(validate_reference),
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def suggest(
+    q: Annotated[str, Query(max_length=64)] = "",
+    limit: Annotated[int, Query(gt=0, le=50)] = 10,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> SuggestResponse:
+    return SuggestResponse(
+        query=q,
+        suggestions=suggest_references(
+            q, bible_version.pythonbible_version(), limit
+        ),
+    )
+
+
+@router.get(
+    "/read",
+    response_model=ReadResponse,
+    status_code=status.HTTP_200_OK,
+)
+def read(
+    limit: Annotated[int, Query(gt=0, le=MAX_PASSAGE_VERSES)] = 25,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+    ordinal: int = Depends(validate_read_start),
+) -> ReadResponse:
+    verses, next_cursor = read_verses(ordinal, limit, bible_version)
+
+    _verses: list[ReadVerse] = []
+
+    for verse_id, verse_text in verses:
+        book, chapter, verse = split_verse_id(verse_id)
+
+        _verses.append(
+            ReadVerse(
+                verse_id=verse_id,
+                reference="{} {}:{}".format(book.title, chapter, verse),
+                verse_text=verse_text,
+            )
+        )
+
+    return ReadResponse(
+        bible_version=bible_version.pythonbible_version().title,
+        verses=_verses,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/plans",
+    response_model=PlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+def plans(
+    response: Response,
+    days: Annotated[int, Query(gt=0, le=3650)] = 365,
+    balance: PlanBalance = PlanBalance.VERSES,
     book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
     bible_version: AcceptedVersion = AcceptedVersion.NIV,
-) -> VerseResponse:
+) -> PlanResponse:
     try:
-        (_, _), verse_text = get_parsed_verse(reference, bible_version)
-    except InvalidVerseError as e:
-        raise HTTPException(status_code=404, detail=e.message)
+        portions = reading_plan(
+            book_group, bible_version.pythonbible_version(), days, balance
+        )
+    except InvalidArgumentsError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    # Plans only depend on the query parameters
+    response.headers["Cache-Control"] = "public, max-age=86400"
+
+    return PlanResponse(
+        book_group=book_group,
+        bible_version=bible_version.pythonbible_version().title,
+        balance=balance,
+        days=[
+            PlanPortion(day=day, reference=reference, verse_count=verse_count)
+            for day, (reference, verse_count) in enumerate(portions, 1)
+        ],
+    )
+
+
+@router.get(
+    "/concordance/{word}",
+    response_model=ConcordanceResponse,
+    status_code=status.HTTP_200_OK,
+)
+def concordance(
+    word: str,
+    limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> ConcordanceResponse:
+    _word = normalize_text(word.strip())
+
+    if not re.fullmatch(WORD_REGEX, _word):
+        raise HTTPException(
+            status_code=400, detail="{} is not a word".format(word)
+        )
+
+    _book_group = book_group.pythonbible_book_group()
+    books = set(_book_group.books) if _book_group else None
+
+    _concordance = get_concordance(bible_version.pythonbible_version())
+    book_counts = {
+        book: count
+        for book, count in _concordance.book_counts(_word).items()
+        if books is None or book in books
+    }
+
+    verses: list[ConcordanceVerse] = []
+
+    for verse_id, count in _concordance.top_verses(_word, books, limit):
+        book, chapter, verse = split_verse_id(verse_id)
+
+        verses.append(
+            ConcordanceVerse(
+                verse_id=verse_id,
+                reference="{} {}:{}".format(book.title, chapter, verse),
+                count=count,
+            )
+        )
+
+    return ConcordanceResponse(
+        word=_word,
+        book_group=book_group,
+        bible_version=bible_version.pythonbible_version().title,
+        total=sum(book_counts.values()),
+        books={
+            book.title: count
+            for book, count in sorted(
+                book_counts.items(), key=lambda item: item[0].value
+            )
+        },
+        verses=verses,
+    )
+
+
+@router.get("/corpus", response_class=StreamingResponse)
+def corpus(
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> StreamingResponse:
+    _bible_version = bible_version.pythonbible_version()
+
+    return StreamingResponse(
+        iter_ndjson(_bible_version, book_group),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": 'attachment; filename="{}.ndjson"'.format(
+                bible_version.value
+            )
+        },
+    )
+
+
+@router.get(
+    "/versions",
+    response_model=VersionsResponse,
+    status_code=status.HTTP_200_OK,
+)
+def versions() -> VersionsResponse:
+    return VersionsResponse(
+        bundled=sorted(
+            {
+                version.pythonbible_version().title
+                for version in AcceptedVersion
+            }
+        ),
+        local=[
+            LocalVersionInfo(version_id=version_id, title=title, loaded=loaded)
+            for version_id, title, loaded in version_registry.versions()
+        ],
+    )
+
+
+@router.get(
+    "/versions/{version_id}/{reference}",
+    response_model=VerseResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_from_local_version(
+    version_id: str,
+    passage: Passage = Depends(validate_passage),
+) -> VerseResponse:
+    version = version_registry.get(version_id)
+
+    if version is None:
+        raise HTTPException(
+            status_code=404, detail="{} not found".format(version_id)
+        )
+
+    verse_text = [
+        "{}. {}".format(verse_id % CHAPTER_PLACE, text)
+        for start, end in passage.ranges
+        for verse_id, text in version.verse_texts(start, end)
+    ]
+
+    if not verse_text:
+        raise HTTPException(
+            status_code=404,
+            detail="{} not in {}".format(passage.reference, version.title),
+        )
 
     return VerseResponse(
-        reference=reference,
+        reference=passage.reference,
         verse_text=verse_text,
+        book_group=AcceptedBookGroup.ANY,
+        bible_version=version.title,
+    )
+
+
+@router.get(
+    "/compare/{reference}",
+    response_model=CompareResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def compare_versions(
+    passage: Passage = Depends(validate_passage),
+    versions: Annotated[list[AcceptedVersion], Query()] = [
+        AcceptedVersion.NIV,
+        AcceptedVersion.KJV,
+        AcceptedVersion.ASV,
+    ],
+) -> CompareResponse:
+    verse_ids, texts = await compare_verse_texts(passage, versions)
+
+    verses: list[ComparedVerse] = []
+
+    for index, verse_id in enumerate(verse_ids):
+        _, _chapter, _verse = get_book_chapter_verse(verse_id)
+
+        verse_text = {
+            _version.title: version_texts[index]
+            for _version, version_texts in texts.items()
+        }
+
+        verses.append(
+            ComparedVerse(
+                verse_id=verse_id,
+                chapter=_chapter,
+                verse=_verse,
+                verse_text=verse_text,
+                missing_from=[
+                    title for title, text in verse_text.items() if text is None
+                ],
+            )
+        )
+
+    return CompareResponse(
+        reference=passage.reference,
+        bible_versions=[_version.title for _version in texts],
+        verses=verses,
+    )
+
+
+async def encode_verse_response(
+    passage: Passage,
+    verse_response: VerseResponse,
+    response_format: ResponseFormat,
+    fields: list[str] | None,
+    book_group: AcceptedBookGroup,
+    bible_version: AcceptedVersion,
+) -> Response:
+    """Encodes a verse response in the negotiated format. Compact formats
+    are built from the passage's verse ids and plain text, without the
+    numbered strings or pydantic.
+
+    Args:
+        passage (Passage): passage of the response.
+        verse_response (VerseResponse): response in the default JSON format,
+            its verse_text left empty for compact formats.
+        response_format (ResponseFormat): negotiated format.
+        fields (list[str] | None): only return these fields.
+        book_group (AcceptedBookGroup): book group of the request.
+        bible_version (AcceptedVersion): Bible version of the text.
+
+    Raises:
+        HTTPException: Raised if the version has no text for the passage,
+            whether or not the text is among the fields.
+
+    Returns:
+        Response: encoded response.
+    """
+    if fields and "verse_text" not in fields:
+        try:
+            check_passage_text(passage, bible_version)
+        except InvalidVerseError as e:
+            raise HTTPException(status_code=404, detail=e.message)
+
+    if response_format is ResponseFormat.JSON:
+        return JSONResponse(
+            content=select_fields(
+                verse_response.model_dump(mode="json"), fields
+            ),
+            headers={"Vary": "Accept"},
+        )
+
+    verses: tuple[tuple[int, str], ...] = ()
+
+    if not fields or "verse_text" in fields:
+        try:
+            verses = await get_passage_verses_coalesced(passage, bible_version)
+        except InvalidVerseError as e:
+            raise HTTPException(status_code=404, detail=e.message)
+
+    return encoded_response(
+        compact_verse_payload(
+            verse_response.reference, verses, book_group, bible_version, fields
+        ),
+        response_format,
+    )
+
+
+@router.get("/{reference}")
+async def get_from_reference(
+    request: Request,
+    response: Response,
+    passage: Passage = Depends(validate_passage),
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+    response_format: ResponseFormat = Depends(negotiate_format),
+    fields: list[str] | None = Depends(validate_fields),
+) -> VerseResponse:
+    redirect = canonical_redirect(request, reference=passage.reference)
+
+    if redirect:
+        return redirect  # pyright:ignore[reportReturnType]
+
+    response.headers["Vary"] = "Accept"
+    verse_text: tuple[str, ...] = ()
+
+    if response_format is ResponseFormat.JSON and (
+        not fields or "verse_text" in fields
+    ):
+        try:
+            verse_text = await get_passage_text_coalesced(
+                passage, bible_version
+            )
+        except InvalidVerseError as e:
+            raise HTTPException(status_code=404, detail=e.message)
+
+    _verse_response = VerseResponse(
+        reference=passage.reference,
+        verse_text=list(verse_text),
         book_group=book_group,
         bible_version=bible_version.pythonbible_version().title,
     )
 
+    if response_format is ResponseFormat.JSON and not fields:
+        return _verse_response
+
+    return await encode_verse_response(
+        passage,
+        _verse_response,
+        response_format,
+        fields,
+        book_group,
+        bible_version,
+    )  # pyright:ignore[reportReturnType]
+
 
 @router.get(
     "/{book}/{chapter}/{verse}",
@@ -75,22 +504,64 @@ async def get_from_reference(
     status_code=status.HTTP_200_OK,
 )
 async def get_verse(
+    request: Request,
+    response: Response,
     book: str = Depends(validate_book),
     chapter: int = Depends(validate_chapter),
     verse: str = Depends(validate_verse),
     book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
     bible_version: AcceptedVersion = AcceptedVersion.NIV,
+    response_format: ResponseFormat = Depends(negotiate_format),
+    fields: list[str] | None = Depends(validate_fields),
 ) -> VerseResponse:
+    redirect = canonical_redirect(
+        request, book=book, chapter=chapter, verse=verse
+    )
+
+    if redirect:
+        return redirect  # pyright:ignore[reportReturnType]
+
+    response.headers["Vary"] = "Accept"
     reference = f"{book.strip()} {chapter}:{verse.strip()}"
 
-    try:
-        (_, _), verse_text = get_parsed_verse(reference, bible_version)
-    except InvalidVerseError as e:
-        raise HTTPException(status_code=404, detail=e.message)
+    # Same passage as `/{reference}`, so both routes share lookups
+    _book: Book = get_book(book)  # pyright:ignore[reportAssignmentType]
+    start, _, end = verse.strip().partition("-")
+    passage = Passage(
+        [
+            (
+                get_verse_id(_book, chapter, int(start)),
+                get_verse_id(_book, chapter, int(end or start)),
+            )
+        ]
+    )
+    verse_text: tuple[str, ...] = ()
 
-    return VerseResponse(
+    if response_format is ResponseFormat.JSON and (
+        not fields or "verse_text" in fields
+    ):
+        try:
+            verse_text = await get_passage_text_coalesced(
+                passage, bible_version
+            )
+        except InvalidVerseError as e:
+            raise HTTPException(status_code=404, detail=e.message)
+
+    _verse_response = VerseResponse(
         reference=reference,
-        verse_text=verse_text,
+        verse_text=list(verse_text),
         book_group=book_group,
         bible_version=bible_version.pythonbible_version().title,
     )
+
+    if response_format is ResponseFormat.JSON and not fields:
+        return _verse_response
+
+    return await encode_verse_response(
+        passage,
+        _verse_response,
+        response_format,
+        fields,
+        book_group,
+        bible_version,
+    )  # pyright:ignore[reportReturnType]
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
+
+from fastapi.concurrency import run_in_threadpool
+from pythonbible import Version
+
+from src.schemas import AcceptedVersion, DailyVerseResponse
+from src.service import get_daily_verse
+
+logger = logging.getLogger(__name__)
+
+# Comment line sent to idle subscribers so proxies keep the connection open
+KEEPALIVE = b": keepalive\n\n"
+KEEPALIVE_SECONDS = 15
+
+# Wait a little past midnight so `date.today()` has surely rolled over
+ROLLOVER_DELAY_SECONDS = 1
+
+# Wait before trying again when publishing the new verse failed
+ROLLOVER_RETRY_SECONDS = 60
+
+
+def seconds_until_rollover() -> float:
+    """Seconds from now until just past the next midnight."""
+    now = datetime.now()
+    midnight = datetime.combine(
+        now.date() + timedelta(days=1), datetime.min.time()
+    )
+
+    return (midnight - now).total_seconds() + ROLLOVER_DELAY_SECONDS
+
+
+class _Channel:
+    __slots__ = ("bible_version", "day", "payload", "event", "subscribers")
+
+    def __init__(self, bible_version: AcceptedVersion) -> None:
+        self.bible_version = bible_version
+        self.day: date | None = None
+        self.payload = b""
+        self.event = asyncio.Event()
+        self.subscribers = 0
+
+
+class DailyVerseBroadcaster:
+    """Pushes the daily verse to Server-Sent Events subscribers.
+
+    Each version has one channel holding the current event, serialized once,
+    and an asyncio.Event every subscriber waits on. Publishing replaces the
+    payload and sets the event, waking all subscribers at once, then puts a
+    fresh event in its place. Idle subscribers cost a waiting coroutine and
+    no polling of the daily verse storage.
+
+    A background task, started with the first subscriber, publishes the new
+    verse of every channel right after midnight. If that fails it is logged
+    and tried again every ROLLOVER_RETRY_SECONDS until it succeeds.
+    """
+
+    def __init__(self) -> None:
+        self.__channels: dict[Version, _Channel] = {}
+        self.__task: asyncio.Task[None] | None = None
+        self.__events: int = 0
+
+    async def subscribe(
+        self, bible_version: AcceptedVersion
+    ) -> AsyncIterator[bytes]:
+        """Current daily verse, then every new one, as SSE events, with
+        keepalive comments in between.
+
+        Args:
+            bible_version (AcceptedVersion): Bible version of the verse.
+
+        Yields:
+            bytes: SSE events and keepalives.
+        """
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__rollover())
+
+        channel = self.__channels.get(bible_version.pythonbible_version())
+
+        if channel is None:
+            channel = _Channel(bible_version)
+            self.__channels[bible_version.pythonbible_version()] = channel
+
+        if channel.day != date.today():
+            await self.__publish(channel)
+
+        channel.subscribers += 1
+
+        try:
+            # Day of the last event sent. A publish while this generator is
+            # suspended at a `yield` swaps the event before it is waited on,
+            # so the day is compared before every wait.
+            day: date | None = None
+
+            while True:
+                if channel.day != day:
+                    day = channel.day
+                    yield channel.payload
+                    continue
+
+                try:
+                    await asyncio.wait_for(
+                        channel.event.wait(), KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield KEEPALIVE
+        finally:
+            channel.subscribers -= 1
+
+    def stats(self) -> dict[str, int]:
+        """Counters describing the subscribers.
+
+        Returns:
+            dict[str, int]: channels, current subscribers and events
+                published.
+        """
+        return {
+            "channels": len(self.__channels),
+            "subscribers": sum(
+                channel.subscribers for channel in self.__channels.values()
+            ),
+            "events": self.__events,
+        }
+
+    async def publish(self) -> None:
+        """Publishes the daily verse of every channel whose verse changed."""
+        for channel in list(self.__channels.values()):
+            await self.__publish(channel)
+
+    async def __publish(self, channel: _Channel) -> None:
+        verse = await run_in_threadpool(get_daily_verse, channel.bible_version)
+
+        if verse.day == channel.day:
+            return
+
+        data = DailyVerseResponse(**verse.model_dump()).model_dump_json()
+
+        channel.day = verse.day
+        channel.payload = "id: {}\nevent: daily-verse\ndata: {}\n\n".format(
+            verse.day.isoformat(), data
+        ).encode()
+        self.__events += 1
+
+        event, channel.event = channel.event, asyncio.Event()
+        event.set()
+
+    async def __rollover(self) -> None:
+        delay = seconds_until_rollover()
+
+        while True:
+            await asyncio.sleep(delay)
+
+            try:
+                await self.publish()
+            except Exception:
+                # Channels already published are skipped on the next try
+                logger.exception(
+                    "Daily verse rollover failed, retrying in {} s".format(
+                        ROLLOVER_RETRY_SECONDS
+                    )
+                )
+                delay = ROLLOVER_RETRY_SECONDS
+            else:
+                delay = seconds_until_rollover()
+
+
+daily_verse_broadcaster = DailyVerseBroadcaster()
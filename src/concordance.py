@@ -0,0 +1,197 @@
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from itertools import islice
+
+from pythonbible import Book, Version
+
+from src.service import get_verse_texts
+from src.verse_table import BOOK_PLACE, verse_table
+
+# A word is a run of letters, optionally with an apostrophe (eg `lord's`)
+WORD_REGEX = r"[a-z]+(?:'[a-z]+)?"
+
+# Typographic apostrophes (as in the NIV text) read as `'`
+APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'", "\u02bc": "'"})
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and straighten its apostrophes, so `Lord’s` and
+    `lord's` are the same word.
+
+    Args:
+        text (str): text to normalize.
+
+    Returns:
+        str: normalized text.
+    """
+    return text.lower().translate(APOSTROPHES)
+
+
+class Concordance:
+    """Word frequency tables for one version of the Bible.
+
+    Built once from the text. For every word it keeps the number of times it
+    appears in each book and the verses it appears in, grouped by book and
+    most occurrences first within a book, so lookups never touch the text
+    again and a lookup in some books only reads those books' verses. Words
+    found in more than one book also keep the order of their verses across
+    all books.
+    """
+
+    def __init__(self, bible_version: Version) -> None:
+        self.__book_counts: dict[str, dict[int, int]] = {}
+        self.__verses: dict[str, tuple[array, array]] = {}
+        self.__ranks: dict[str, array] = {}
+
+        verse_ids: list[int] = []
+
+        for book in verse_table.books(bible_version):
+            start, end = verse_table.book_ordinals(book)
+            verse_ids.extend(
+                verse_table.iter_verse_ids(
+                    verse_table.verse_id(start), verse_table.verse_id(end - 1)
+                )
+            )
+
+        occurrences: dict[str, list[tuple[int, int]]] = {}
+
+        for verse_id, text in zip(
+            verse_ids, get_verse_texts(verse_ids, bible_version)
+        ):
+            words = Counter(
+                re.findall(WORD_REGEX, normalize_text(text or ""))
+            )
+
+            for word, count in words.items():
+                occurrences.setdefault(word, []).append((verse_id, count))
+
+                book_counts = self.__book_counts.setdefault(word, {})
+                book = verse_id // BOOK_PLACE
+                book_counts[book] = book_counts.get(book, 0) + count
+
+        for word, verses in occurrences.items():
+            verses.sort(
+                key=lambda verse: (verse[0] // BOOK_PLACE, -verse[1], verse[0])
+            )
+
+            self.__verses[word] = (
+                array("I", (verse_id for verse_id, _ in verses)),
+                array("H", (count for _, count in verses)),
+            )
+
+            if len(self.__book_counts[word]) > 1:
+                self.__ranks[word] = array(
+                    "I",
+                    sorted(
+                        range(len(verses)),
+                        key=lambda i: (-verses[i][1], verses[i][0]),
+                    ),
+                )
+
+    def book_counts(self, word: str) -> dict[Book, int]:
+        """Times a word appears in each book.
+
+        Args:
+            word (str): lowercase word.
+
+        Returns:
+            dict[Book, int]: count per book, books without the word left out.
+        """
+        return {
+            Book(book): count
+            for book, count in self.__book_counts.get(word, {}).items()
+        }
+
+    def top_verses(
+        self, word: str, books: set[Book] | None = None, limit: int = 10
+    ) -> list[tuple[int, int]]:
+        """Verses where a word appears most.
+
+        Args:
+            word (str): lowercase word.
+            books (set[Book] | None, optional): only look in these books.
+                Defaults to None, all books.
+            limit (int, optional): most verses to return. Defaults to 10.
+
+        Returns:
+            list[tuple[int, int]]: verse ids and counts, most occurrences
+            first.
+        """
+        if word not in self.__verses:
+            return []
+
+        verse_ids, counts = self.__verses[word]
+
+        if not books:
+            ranks = self.__ranks.get(word, range(len(verse_ids)))
+
+            return [(verse_ids[i], counts[i]) for i in islice(ranks, limit)]
+
+        book_values = self.__book_counts[word].keys() & {
+            book.value for book in books
+        }
+
+        def book_verses(book: int) -> Iterator[tuple[int, int]]:
+            # The book's verses are a contiguous run, most occurrences first.
+            # Verse ids are only sorted by book, which is enough to find
+            # where the run starts and ends.
+            start = bisect_left(verse_ids, book * BOOK_PLACE)
+            end = bisect_left(verse_ids, (book + 1) * BOOK_PLACE, start)
+
+            return ((verse_ids[i], counts[i]) for i in range(start, end))
+
+        verses = heapq.merge(
+            *(book_verses(book) for book in book_values),
+            key=lambda verse: (-verse[1], verse[0]),
+        )
+
+        return list(islice(verses, limit))
+
+
+# Built concordances. The lock guards both dicts and is never held while
+# building; each version has its own lock, held while it is built so
+# concurrent first requests for a version build it once without making
+# first requests for other versions wait.
+_concordances: dict[Version, Concordance] = {}
+_concordance_builds: dict[Version, threading.Lock] = {}
+_concordance_lock = threading.Lock()
+
+
+def get_concordance(bible_version: Version) -> Concordance:
+    """Concordance of a version, built on first use. Requests arriving while
+    it is built wait for it instead of building their own.
+
+    Building reads the whole text of the version, which takes a couple of
+    seconds, so the first request for each version is slow unless it was
+    built beforehand (`python -m src.server` does so in `preload`).
+
+    Args:
+        bible_version (Version): Bible version.
+
+    Returns:
+        Concordance: the version's word frequency tables.
+    """
+    concordance = _concordances.get(bible_version)
+
+    if concordance is not None:
+        return concordance
+
+    with _concordance_lock:
+        build = _concordance_builds.setdefault(bible_version, threading.Lock())
+
+    with build:
+        # Built by another request while this one waited
+        concordance = _concordances.get(bible_version)
+
+        if concordance is None:
+            concordance = Concordance(bible_version)
+
+            with _concordance_lock:
+                _concordances[bible_version] = concordance
+
+    return concordance
@@ -1,3 +1,5 @@
+import os
+
 from pythonbible import BookGroup
 
 SHORT_VERSION_NAMES = ["NIV", "ASV", "KJV"]
@@ -24,3 +26,41 @@ MAPPED_BOOK_GROUPS = {
 }
 
 DAILY_VERSE_FILE = "daily_verse.json"
+
+# Most verses a single passage request may return
+MAX_PASSAGE_VERSES = 200
+
+# Redirect (301) v2 requests for a non canonical reference, eg `gen 1:1-1`,
+# to the canonical one, eg `Genesis 1:1`, so caches keep one copy per passage
+CANONICAL_REDIRECT = os.getenv("CANONICAL_REDIRECT", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Directory holding extra versions as `<ID>.jsonl` files, see src/registry.py
+BIBLE_DATA_DIR = os.getenv("BIBLE_DATA_DIR", "data")
+
+# Memory the loaded extra versions may use before the least recently used
+# ones are dropped
+BIBLE_MEMORY_BUDGET_MB = int(os.getenv("BIBLE_MEMORY_BUDGET_MB", "64"))
+
+# Profile a request when it sends this secret in the `X-Profile` header or
+# the `profile` query parameter. Profiling is off when it is not set and the
+# sample rate is 0
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+
+# Share of all requests to profile, between 0 and 1
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Minimum time between two sampled profiles of a worker. Requests sending
+# the secret are not limited
+PROFILE_MIN_INTERVAL_SECONDS = float(
+    os.getenv("PROFILE_MIN_INTERVAL_SECONDS", "10")
+)
+
+# Directory profiles are written to
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Profiles kept in PROFILE_DIR, the oldest ones are deleted past it
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
@@ -0,0 +1,257 @@
+import argparse
+import json
+import sys
+from array import array
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from pythonbible import Book, Version
+
+from src.schemas import AcceptedBookGroup, AcceptedVersion
+from src.service import get_verse_texts
+from src.utils import plan_books
+from src.verse_table import BOOK_PLACE, CHAPTER_PLACE, verse_table
+
+# Every group but ANY, in the order of their bits in the `groups` column
+GROUPS = [
+    group for group in AcceptedBookGroup if group is not AcceptedBookGroup.ANY
+]
+
+# Columns of the columnar layout: name and array type code
+COLUMNS = [
+    ("verse_id", "I"),
+    ("book", "B"),
+    ("chapter", "H"),
+    ("verse", "H"),
+    ("groups", "H"),
+]
+
+COLUMN_TYPES = {"B": "uint8", "H": "uint16", "I": "uint32", "Q": "uint64"}
+
+
+@lru_cache
+def book_groups(book: Book) -> tuple[int, tuple[str, ...]]:
+    """Groups a book belongs to.
+
+    Args:
+        book (Book): a book of the bible.
+
+    Returns:
+        tuple[int, tuple[str, ...]]: bitmask of the groups (bit i being
+        GROUPS[i]) and their names.
+    """
+    mask, names = 0, []
+
+    for bit, group in enumerate(GROUPS):
+        _book_group = group.pythonbible_book_group()
+
+        if _book_group and book in _book_group.books:
+            mask |= 1 << bit
+            names.append(group.value)
+
+    return mask, tuple(names)
+
+
+def iter_corpus(
+    bible_version: Version,
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+) -> Iterator[tuple[int, Book, int, int, str | None]]:
+    """Walks every verse of a version in reading order.
+
+    Text is looked up one chapter at a time, so memory use does not grow
+    with the size of the corpus.
+
+    Args:
+        bible_version (Version): Bible version to dump.
+        book_group (AcceptedBookGroup, optional): only dump the books of this
+            group. Defaults to AcceptedBookGroup.ANY.
+
+    Yields:
+        tuple[int, Book, int, int, str | None]: verse id, book, chapter,
+        verse and text.
+    """
+    for book in plan_books(book_group, bible_version):
+        for chapter in range(1, verse_table.chapter_count(book) + 1):
+            base = book.value * BOOK_PLACE + chapter * CHAPTER_PLACE
+            verses = verse_table.verse_count(book, chapter)
+            verse_ids = [base + verse for verse in range(1, verses + 1)]
+
+            for verse_id, text in zip(
+                verse_ids, get_verse_texts(verse_ids, bible_version)
+            ):
+                yield verse_id, book, chapter, verse_id % CHAPTER_PLACE, text
+
+
+def iter_ndjson(
+    bible_version: Version,
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+) -> Iterator[bytes]:
+    """Verses of a version as newline delimited JSON, one line per verse.
+
+    Args:
+        bible_version (Version): Bible version to dump.
+        book_group (AcceptedBookGroup, optional): only dump the books of this
+            group. Defaults to AcceptedBookGroup.ANY.
+
+    Yields:
+        bytes: a JSON object and a newline.
+    """
+    for verse_id, book, chapter, verse, text in iter_corpus(
+        bible_version, book_group
+    ):
+        line = json.dumps(
+            {
+                "verse_id": verse_id,
+                "book": book.title,
+                "chapter": chapter,
+                "verse": verse,
+                "groups": book_groups(book)[1],
+                "text": text,
+            },
+            ensure_ascii=False,
+        )
+        yield (line + "\n").encode()
+
+
+def write_columns(
+    out: Path,
+    bible_version: Version,
+    book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
+) -> dict[str, Any]:
+    """Writes the verses of a version as one file of packed integers per
+    column, native byte order, plus the text as UTF-8 with offsets.
+
+    Row i's text is `text.bin[text_offset[i]:text_offset[i + 1]]`, empty when
+    the version has no text for the verse. `schema.json` describes the files.
+
+    Args:
+        out (Path): output directory.
+        bible_version (Version): Bible version to dump.
+        book_group (AcceptedBookGroup, optional): only dump the books of this
+            group. Defaults to AcceptedBookGroup.ANY.
+
+    Returns:
+        dict[str, Any]: the schema written to schema.json.
+    """
+    out.mkdir(parents=True, exist_ok=True)
+
+    files = {
+        name: open(out / "{}.bin".format(name), "wb") for name, _ in COLUMNS
+    }
+    offsets_file = open(out / "text_offset.bin", "wb")
+    text_file = open(out / "text.bin", "wb")
+
+    rows, offset = 0, 0
+
+    try:
+        array("Q", [0]).tofile(offsets_file)
+
+        # Buffered one chapter at a time
+        chapter_key = None
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        offsets, texts = array("Q"), bytearray()
+
+        def flush() -> None:
+            for name, column in columns.items():
+                column.tofile(files[name])
+                del column[:]
+
+            offsets.tofile(offsets_file)
+            text_file.write(texts)
+            del offsets[:], texts[:]
+
+        for verse_id, book, chapter, verse, text in iter_corpus(
+            bible_version, book_group
+        ):
+            if (book, chapter) != chapter_key:
+                flush()
+                chapter_key = book, chapter
+
+            encoded = (text or "").encode()
+            offset += len(encoded)
+            rows += 1
+
+            columns["verse_id"].append(verse_id)
+            columns["book"].append(book.value)
+            columns["chapter"].append(chapter)
+            columns["verse"].append(verse)
+            columns["groups"].append(book_groups(book)[0])
+            offsets.append(offset)
+            texts.extend(encoded)
+
+        flush()
+    finally:
+        for file in [*files.values(), offsets_file, text_file]:
+            file.close()
+
+    schema = {
+        "bible_version": bible_version.title,
+        "book_group": book_group.value,
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "columns": [
+            {
+                "name": name,
+                "file": "{}.bin".format(name),
+                "type": COLUMN_TYPES[typecode],
+                "itemsize": array(typecode).itemsize,
+            }
+            for name, typecode in COLUMNS
+        ],
+        "text": {
+            "offsets": "text_offset.bin",
+            "offsets_type": COLUMN_TYPES["Q"],
+            "data": "text.bin",
+            "encoding": "utf-8",
+        },
+        "books": {book.value: book.title for book in Book},
+        "groups": [group.value for group in GROUPS],
+    }
+
+    (out / "schema.json").write_text(json.dumps(schema, indent=2))
+
+    return schema
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.corpus",
+        description="Dump the text of a Bible version with its tags.",
+    )
+    parser.add_argument(
+        "out",
+        type=Path,
+        help="output file for ndjson (`-` for stdout), directory for columns",
+    )
+    parser.add_argument(
+        "--format", choices=["ndjson", "columns"], default="ndjson"
+    )
+    parser.add_argument(
+        "--bible-version", type=AcceptedVersion, default=AcceptedVersion.NIV
+    )
+    parser.add_argument(
+        "--book-group", type=AcceptedBookGroup, default=AcceptedBookGroup.ANY
+    )
+    args = parser.parse_args()
+
+    bible_version = args.bible_version.pythonbible_version()
+
+    if args.format == "columns":
+        schema = write_columns(args.out, bible_version, args.book_group)
+        print("{} rows".format(schema["rows"]), file=sys.stderr)
+        return
+
+    if str(args.out) == "-":
+        sys.stdout.buffer.writelines(
+            iter_ndjson(bible_version, args.book_group)
+        )
+        return
+
+    with open(args.out, "wb") as out:
+        out.writelines(iter_ndjson(bible_version, args.book_group))
+
+
+if __name__ == "__main__":
+    main()
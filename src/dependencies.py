@@ -1,10 +1,22 @@
-from fastapi import HTTPException
+from typing import Annotated
 
-from pythonbible.bible import titles
-from pythonbible.validator import is_valid_chapter, is_valid_verse
+from fastapi import Header, HTTPException, Query
 
+from pythonbible import Book, get_verse_id
+
+from src.constants import MAX_PASSAGE_VERSES
+from src.encoders import (
+    VERSE_FIELDS,
+    ResponseFormat,
+    available_formats,
+    negotiate,
+)
+from src.exceptions import BookNotFoundError, InvalidArgumentsError
+from src.passages import Passage
 from src.schemas import AcceptedBookGroup, AcceptedVersion
-from src.utils import get_book, parse_reference
+from src.suggest import book_ngrams
+from src.utils import decode_cursor, get_book, parse_passage, parse_reference
+from src.verse_table import verse_table
 
 
 def validate_book(
@@ -48,7 +60,7 @@ def validate_book(
                     _book.title, book_group.value
                 ),
             )
-        elif _book not in titles.SHORT_TITLES[_pythonbible_version].keys():
+        elif not verse_table.has_book(_pythonbible_version, _book):
             raise HTTPException(
                 status_code=400,
                 detail="{} not in {}".format(
@@ -58,7 +70,22 @@ def validate_book(
         else:
             return _book.title
 
-    raise HTTPException(status_code=400, detail="{} not found".format(book))
+    raise book_not_found(book)
+
+
+def book_not_found(book: str) -> BookNotFoundError:
+    """Error for a book that cannot be found, suggesting the closest
+    book names.
+
+    Args:
+        book (str): the book that was not found.
+
+    Returns:
+        BookNotFoundError: error to raise.
+    """
+    return BookNotFoundError(
+        book, [_book.title for _book in book_ngrams.search(book)]
+    )
 
 
 def validate_chapter(book: str, chapter: int) -> int:
@@ -79,11 +106,9 @@ def validate_chapter(book: str, chapter: int) -> int:
     _book = get_book(book)
 
     if not _book:
-        raise HTTPException(
-            status_code=400, detail="{} not found".format(book)
-        )
+        raise book_not_found(book)
 
-    if is_valid_chapter(_book, chapter):
+    if verse_table.is_valid_chapter(_book, chapter):
         return chapter
 
     raise HTTPException(
@@ -112,9 +137,7 @@ def validate_verse(verse: str, book: str, chapter: int) -> str:
     _book = get_book(book)
 
     if not _book:
-        raise HTTPException(
-            status_code=400, detail="{} not found".format(book)
-        )
+        raise book_not_found(book)
 
     try:
         from_verse, to_verse = (
@@ -138,7 +161,7 @@ def validate_verse(verse: str, book: str, chapter: int) -> str:
                 detail="verse ({}) cannot be less than 1".format(from_verse),
             )
 
-        if is_valid_verse(_book, chapter, to_verse):
+        if verse_table.is_valid_verse(_book, chapter, to_verse):
             return (
                 "{}-{}".format(from_verse, to_verse)
                 if from_verse != to_verse
@@ -212,6 +235,83 @@ def validate_reference(
     return f"{_book.strip()} {_chapter}:{_verse.strip()}"
 
 
+def validate_passage(reference: str) -> Passage:
+    """Check if the given passage is valid. A passage is one or more
+    references separated by `,` or `;` where each one may span chapters,
+    eg `Genesis 1:26-2:3` or `John 3:16, 18; Romans 5:8`.
+
+    Args:
+        reference (str): the passage to check.
+
+    Raises:
+        HTTPException: Raised if the passage cannot be parsed.
+        HTTPException: Raised if a book, chapter or verse is invalid.
+        HTTPException: Raised if a range ends before it starts.
+        HTTPException: Raised if the passage has more than
+            MAX_PASSAGE_VERSES verses.
+
+    Returns:
+        Passage: the passage resolved into merged verse id ranges.
+    """
+
+    try:
+        ranges = parse_passage(reference)
+    except InvalidArgumentsError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    verse_ranges: list[tuple[int, int]] = []
+
+    for book, start_chapter, start_verse, end_chapter, end_verse in ranges:
+        validate_book(book)
+        _book: Book = get_book(book)  # pyright:ignore[reportAssignmentType]
+
+        validate_chapter(book, start_chapter)
+        validate_chapter(book, end_chapter)
+
+        for chapter, verse in (
+            (start_chapter, start_verse),
+            (end_chapter, end_verse),
+        ):
+            if verse <= 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail="verse ({}) cannot be less than 1".format(verse),
+                )
+
+            if not verse_table.is_valid_verse(_book, chapter, verse):
+                raise HTTPException(
+                    status_code=400,
+                    detail="verse {} not found in {} {}".format(
+                        verse, _book.title, chapter
+                    ),
+                )
+
+        start = get_verse_id(_book, start_chapter, start_verse)
+        end = get_verse_id(_book, end_chapter, end_verse)
+
+        if start > end:
+            raise HTTPException(
+                status_code=400,
+                detail="start ({}:{}) cannot be after end ({}:{})".format(
+                    start_chapter, start_verse, end_chapter, end_verse
+                ),
+            )
+
+        verse_ranges.append((start, end))
+
+    passage = Passage(verse_ranges)
+
+    if passage.verse_count > MAX_PASSAGE_VERSES:
+        raise HTTPException(
+            status_code=400,
+            detail="passage cannot have more than {} verses".format(
+                MAX_PASSAGE_VERSES
+            ),
+        )
+
+    return passage
+
+
 def validate_random_book(
     r_book: str | None = None,
     book_group: AcceptedBookGroup = AcceptedBookGroup.ANY,
@@ -261,3 +361,121 @@ def validate_random_chapter(
         )
 
     return validate_chapter(r_book, r_chapter)
+
+
+def validate_read_start(
+    from_reference: Annotated[str | None, Query(alias="from")] = None,
+    cursor: str | None = None,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> int:
+    """Work out where reading starts, from either a reference or a cursor
+    returned by a previous page.
+
+    Args:
+        from_reference (str | None, optional): reference of the first verse.
+            Defaults to None.
+        cursor (str | None, optional): cursor of a previous page. Takes
+            precedence over from_reference. Defaults to None.
+        bible_version (AcceptedVersion, optional): Bible version to use.
+            Defaults to NIV.
+
+    Raises:
+        HTTPException: Raised if neither from_reference nor cursor is given.
+        HTTPException: Raised if the cursor is invalid or was made for another
+            bible version.
+
+    Returns:
+        int: ordinal of the first verse to read.
+    """
+
+    if cursor:
+        try:
+            version, ordinal = decode_cursor(cursor)
+        except InvalidArgumentsError as e:
+            raise HTTPException(status_code=400, detail=e.message)
+
+        if version != bible_version.pythonbible_version().value:
+            raise HTTPException(
+                status_code=400,
+                detail="cursor is not for {}".format(
+                    bible_version.pythonbible_version().title
+                ),
+            )
+
+        if not 0 <= ordinal < verse_table.total_verses:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return ordinal
+
+    if not from_reference:
+        raise HTTPException(
+            status_code=400, detail="Must provide `from` or `cursor`"
+        )
+
+    passage = validate_passage(from_reference)
+
+    return verse_table.ordinal(passage.ranges[0][0])
+
+
+def validate_fields(fields: str | None = None) -> list[str] | None:
+    """Check the fields picked for a verse response.
+
+    Args:
+        fields (str | None, optional): comma separated field names, eg
+            `reference,verse_text`. Defaults to None, all fields.
+
+    Raises:
+        HTTPException: Raised if a field is not part of a verse response.
+
+    Returns:
+        list[str] | None: field names, or None for all fields.
+    """
+
+    if not fields:
+        return None
+
+    _fields = [field.strip() for field in fields.split(",") if field.strip()]
+
+    for field in _fields:
+        if field not in VERSE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail="Unknown field {}, expected one of {}".format(
+                    field, ", ".join(VERSE_FIELDS)
+                ),
+            )
+
+    return _fields or None
+
+
+def negotiate_format(
+    accept: Annotated[str | None, Header()] = None,
+) -> ResponseFormat:
+    """Pick the response format from the Accept header.
+
+    Args:
+        accept (str | None, optional): Accept header. Defaults to None.
+
+    Raises:
+        HTTPException: Raised if the client only accepts formats the server
+            cannot produce, eg MessagePack without msgpack installed.
+
+    Returns:
+        ResponseFormat: format to respond with.
+    """
+
+    response_format = negotiate(accept)
+
+    if response_format is None:
+        raise HTTPException(
+            status_code=406,
+            detail="Cannot respond with {}, available: {}".format(
+                accept,
+                ", ".join(
+                    response_format.value
+                    for response_format in available_formats()
+                ),
+            ),
+        )
+
+    return response_format
@@ -0,0 +1,170 @@
+import json
+from collections.abc import Iterable
+from enum import StrEnum
+from typing import Any
+
+from fastapi import Response
+
+from src.constants import SHORT_VERSION_NAMES
+from src.schemas import AcceptedBookGroup, AcceptedVersion
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ResponseFormat(StrEnum):
+    JSON = "application/json"
+    COMPACT_JSON = "application/vnd.bible.compact+json"
+    MSGPACK = "application/msgpack"
+
+
+MEDIA_TYPES = {
+    "*/*": ResponseFormat.JSON,
+    "application/*": ResponseFormat.JSON,
+    "application/json": ResponseFormat.JSON,
+    "application/vnd.bible.compact+json": ResponseFormat.COMPACT_JSON,
+    "application/msgpack": ResponseFormat.MSGPACK,
+    "application/x-msgpack": ResponseFormat.MSGPACK,
+}
+
+# Fields of a verse response that `fields=` can pick from
+VERSE_FIELDS = ["reference", "verse_text", "book_group", "bible_version"]
+
+SHORT_VERSIONS = {
+    AcceptedVersion[name].pythonbible_version(): name
+    for name in SHORT_VERSION_NAMES
+}
+
+
+def available_formats() -> list[ResponseFormat]:
+    return [
+        response_format
+        for response_format in ResponseFormat
+        if response_format is not ResponseFormat.MSGPACK or msgpack
+    ]
+
+
+def negotiate(accept: str | None) -> ResponseFormat | None:
+    """Picks the response format from an Accept header, by quality then
+    order. Types the API doesn't know about are ignored, so clients that
+    don't ask for a compact format get JSON as before.
+
+    Args:
+        accept (str | None): Accept header.
+
+    Returns:
+        ResponseFormat | None: format to respond with, None if the client
+        only accepts MessagePack and msgpack is not installed.
+    """
+    if not accept:
+        return ResponseFormat.JSON
+
+    best: ResponseFormat | None = None
+    best_quality = 0.0
+    unavailable = False
+
+    for item in accept.split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        response_format = MEDIA_TYPES.get(media_type.lower())
+        quality = 1.0
+
+        for param in params:
+            name, _, value = param.partition("=")
+
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+
+        if response_format is None or quality <= 0:
+            continue
+
+        if response_format not in available_formats():
+            unavailable = True
+            continue
+
+        if quality > best_quality:
+            best, best_quality = response_format, quality
+
+    if best is None and unavailable:
+        return None
+
+    return best or ResponseFormat.JSON
+
+
+def select_fields(
+    payload: dict[str, Any], fields: list[str] | None
+) -> dict[str, Any]:
+    if not fields:
+        return payload
+
+    return {name: value for name, value in payload.items() if name in fields}
+
+
+def compact_verse_payload(
+    reference: str,
+    verses: Iterable[tuple[int, str]],
+    book_group: AcceptedBookGroup,
+    bible_version: AcceptedVersion,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
+    """Verse response in the compact form: `verse_text` holds
+    `[verse_id, text]` pairs instead of numbered strings, and the version
+    its short name.
+
+    Args:
+        reference (str): canonical reference.
+        verses (Iterable[tuple[int, str]]): verse ids and plain text.
+        book_group (AcceptedBookGroup): book group of the request.
+        bible_version (AcceptedVersion): Bible version of the text.
+        fields (list[str] | None, optional): only keep these fields.
+            Defaults to None, all fields.
+
+    Returns:
+        dict[str, Any]: payload to encode.
+    """
+    _bible_version = bible_version.pythonbible_version()
+
+    payload: dict[str, Any] = {
+        "reference": reference,
+        "book_group": book_group.value,
+        "bible_version": SHORT_VERSIONS.get(
+            _bible_version, _bible_version.name
+        ),
+    }
+
+    if not fields or "verse_text" in fields:
+        payload["verse_text"] = [[verse_id, text] for verse_id, text in verses]
+
+    return select_fields(payload, fields)
+
+
+def encode(payload: dict[str, Any], response_format: ResponseFormat) -> bytes:
+    """Encodes a payload without going through pydantic.
+
+    Args:
+        payload (dict[str, Any]): JSON compatible payload.
+        response_format (ResponseFormat): format to encode to.
+
+    Returns:
+        bytes: encoded payload.
+    """
+    if response_format is ResponseFormat.MSGPACK:
+        return msgpack.packb(payload)  # pyright:ignore[reportOptionalMemberAccess]
+
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def encoded_response(
+    payload: dict[str, Any], response_format: ResponseFormat
+) -> Response:
+    return Response(
+        content=encode(payload, response_format),
+        media_type=response_format.value,
+        headers={"Vary": "Accept"},
+    )
@@ -1,3 +1,6 @@
+from fastapi import HTTPException
+
+
 class InvalidArgumentsError(Exception):
     """Raised when arguments are not valid"""
 
@@ -6,3 +9,13 @@ class InvalidArgumentsError(Exception):
     def __init__(self, message: str="Invalid arguments"):
         self.message = message
         super().__init__(message)
+
+
+class BookNotFoundError(HTTPException):
+    """Raised when a book cannot be found. Carries the closest book names"""
+
+    suggestions: list[str]
+
+    def __init__(self, book: str, suggestions: list[str]):
+        self.suggestions = suggestions
+        super().__init__(status_code=400, detail="{} not found".format(book))
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import gzip
+import random
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pythonbible import Book
+
+from src.dependencies import (
+    validate_book,
+    validate_chapter,
+    validate_passage,
+    validate_verse,
+)
+from src.schemas import AcceptedBookGroup, AcceptedVersion, VerseResponse
+from src.service import get_passage_text
+from src.utils import get_book, parse_reference
+from src.verse_table import verse_table
+
+DESCRIPTION = """
+Pre-render v2 verse responses to static files.
+
+Files are laid out as <out>/<VERSION>/api/v2/bible/<Book>/<chapter>/<verse>
+so that a static server can serve `/api/...?bible_version=<VERSION>` from
+`<out>/<VERSION>/api/...` with a JSON default type.
+
+The daily verse is not exported: it changes at midnight, so leave
+`/api/v1/bible/daily-verse` to the app.
+"""
+
+# One canonical name per version, NIV and NEW_INTERNATIONAL being the same.
+EXPORT_VERSIONS = [
+    AcceptedVersion.NIV_short,
+    AcceptedVersion.kJV_short,
+    AcceptedVersion.ASV_short,
+]
+
+
+def render(model: BaseModel) -> bytes:
+    """Serializes a response model the way the live endpoints do.
+
+    Args:
+        model (BaseModel): response to serialize.
+
+    Returns:
+        bytes: response body.
+    """
+    return bytes(JSONResponse(content=jsonable_encoder(model)).body)
+
+
+def verse_path(book: str, chapter: int, verse: str) -> str:
+    return "api/v2/bible/{}/{}/{}".format(book, chapter, verse)
+
+
+def render_verse(
+    book: str, chapter: int, verse: str, bible_version: AcceptedVersion
+) -> bytes:
+    """Renders what GET /api/v2/bible/{book}/{chapter}/{verse} returns,
+    reading the text the same way the route does.
+
+    Args:
+        book (str): validated book title.
+        chapter (int): validated chapter.
+        verse (str): validated verse, eg `1` or `1-31`.
+        bible_version (AcceptedVersion): Bible version.
+
+    Returns:
+        bytes: response body.
+    """
+    reference = "{} {}:{}".format(book, chapter, verse)
+    verse_text = get_passage_text(validate_passage(reference), bible_version)
+
+    return render(
+        VerseResponse(
+            reference=reference,
+            verse_text=list(verse_text),
+            book_group=AcceptedBookGroup.ANY,
+            bible_version=bible_version.pythonbible_version().title,
+        )
+    )
+
+
+def chapters(
+    bible_version: AcceptedVersion,
+) -> Iterator[tuple[str, int, str]]:
+    """Every chapter of a version as a (book, chapter, verse range) path.
+
+    Args:
+        bible_version (AcceptedVersion): Bible version.
+
+    Yields:
+        tuple[str, int, str]: book title, chapter and verse range.
+    """
+    for book in verse_table.books(bible_version.pythonbible_version()):
+        for chapter in range(1, verse_table.chapter_count(book) + 1):
+            verses = verse_table.verse_count(book, chapter)
+            yield (
+                book.title,
+                chapter,
+                "1-{}".format(verses) if verses > 1 else "1",
+            )
+
+
+def single_verses(
+    bible_version: AcceptedVersion,
+) -> Iterator[tuple[str, int, str]]:
+    """Every verse of a version as a (book, chapter, verse) path.
+
+    Args:
+        bible_version (AcceptedVersion): Bible version.
+
+    Yields:
+        tuple[str, int, str]: book title, chapter and verse.
+    """
+    for book in verse_table.books(bible_version.pythonbible_version()):
+        for chapter in range(1, verse_table.chapter_count(book) + 1):
+            for verse in range(1, verse_table.verse_count(book, chapter) + 1):
+                yield book.title, chapter, str(verse)
+
+
+def listed_verses(
+    references: list[str], bible_version: AcceptedVersion
+) -> Iterator[tuple[str, int, str]]:
+    """Verses listed as references, validated the way the live route
+    validates its path.
+
+    Args:
+        references (list[str]): references like `John 3:16` or `Psalm 23:1-6`
+        bible_version (AcceptedVersion): Bible version.
+
+    Yields:
+        tuple[str, int, str]: book title, chapter and verse.
+    """
+    for reference in references:
+        book, chapter, verse = parse_reference(reference)
+
+        if chapter is None or verse is None:
+            raise ValueError("Cannot export `{}`".format(reference))
+
+        _book: Book = get_book(book)  # pyright:ignore[reportAssignmentType]
+        _bible_version = bible_version.pythonbible_version()
+
+        # Books missing from a version are skipped, not an error
+        if _book and not verse_table.has_book(_bible_version, _book):
+            continue
+
+        yield (
+            validate_book(book, bible_version=bible_version),
+            validate_chapter(book, chapter),
+            validate_verse(verse, book, chapter),
+        )
+
+
+def write(out: Path, path: str, body: bytes, compress: bool) -> None:
+    file = out / path
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_bytes(body)
+
+    if compress:
+        file.with_name(file.name + ".gz").write_bytes(
+            gzip.compress(body, mtime=0)
+        )
+
+
+def export(
+    out: Path,
+    bible_versions: list[AcceptedVersion],
+    references: list[str],
+    all_verses: bool = False,
+    compress: bool = False,
+) -> list[tuple[str, AcceptedVersion]]:
+    """Writes every chapter and the listed verses of each version.
+
+    Args:
+        out (Path): output directory.
+        bible_versions (list[AcceptedVersion]): versions to export.
+        references (list[str]): verses to export besides the chapters.
+        all_verses (bool, optional): export every single verse as well.
+            Defaults to False.
+        compress (bool, optional): write a gzip copy next to each file.
+            Defaults to False.
+
+    Returns:
+        list[tuple[str, AcceptedVersion]]: url path and version of each
+        exported file.
+    """
+    exported: list[tuple[str, AcceptedVersion]] = []
+
+    for bible_version in bible_versions:
+        root = out / bible_version.value
+
+        paths = dict.fromkeys(chapters(bible_version))
+        paths.update(dict.fromkeys(listed_verses(references, bible_version)))
+
+        if all_verses:
+            paths.update(dict.fromkeys(single_verses(bible_version)))
+
+        for book, chapter, verse in paths:
+            path = verse_path(book, chapter, verse)
+            body = render_verse(book, chapter, verse, bible_version)
+
+            write(root, path, body, compress)
+            exported.append((path, bible_version))
+
+        print("{}: {} files".format(bible_version.value, len(paths)))
+
+    return exported
+
+
+async def check(
+    out: Path, exported: list[tuple[str, AcceptedVersion]]
+) -> list[str]:
+    """Requests exported paths from the app and compares the bodies with
+    the files.
+
+    Args:
+        out (Path): output directory.
+        exported (list[tuple[str, AcceptedVersion]]): paths to check.
+
+    Returns:
+        list[str]: paths whose file differs from the live response.
+    """
+    from src.main import app
+
+    mismatches: list[str] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://export"
+    ) as client:
+        for path, bible_version in exported:
+            response = await client.get(
+                "/" + quote(path),
+                params={"bible_version": bible_version.value},
+            )
+
+            file = out / bible_version.value / path
+
+            if response.content != file.read_bytes():
+                mismatches.append("{} ({})".format(path, bible_version.value))
+
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.export",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("out", type=Path, help="output directory")
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        type=AcceptedVersion,
+        default=EXPORT_VERSIONS,
+        help="versions to export (default: NIV KJV ASV)",
+    )
+    parser.add_argument(
+        "--verses",
+        type=Path,
+        help="file with one reference to export per line, eg `John 3:16`",
+    )
+    parser.add_argument(
+        "--all-verses", action="store_true", help="export every single verse"
+    )
+    parser.add_argument(
+        "--gzip", action="store_true", help="write a .gz copy of each file"
+    )
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=100,
+        metavar="N",
+        help="compare N random files with the live app (default: 100)",
+    )
+    args = parser.parse_args()
+
+    references: list[str] = []
+
+    if args.verses:
+        references = [
+            line.strip()
+            for line in args.verses.read_text().splitlines()
+            if line.strip()
+        ]
+
+    exported = export(
+        args.out, args.versions, references, args.all_verses, args.gzip
+    )
+
+    sample = random.sample(exported, min(args.check, len(exported)))
+    mismatches = asyncio.run(check(args.out, sample))
+
+    for mismatch in mismatches:
+        print("mismatch: {}".format(mismatch), file=sys.stderr)
+
+    print(
+        "checked {} files, {} mismatches".format(len(sample), len(mismatches))
+    )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
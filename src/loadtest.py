@@ -0,0 +1,527 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+
+import httpx
+from starlette.routing import Match
+
+from src import daily_verse
+from src.bible.router import bible_router
+from src.bible_v2.router import router as bible_router_v2
+from src.schemas import AcceptedVersion
+
+ROUTERS = [("/api/v1", bible_router), ("/api/v2", bible_router_v2)]
+
+# Inputs the synthetic mix picks from
+REFERENCES = [
+    ("John", 3, 16),
+    ("Genesis", 1, 1),
+    ("Psalm", 23, 1),
+    ("Romans", 8, 28),
+    ("Proverbs", 3, 5),
+    ("Isaiah", 40, 31),
+    ("Philippians", 4, 13),
+    ("Matthew", 5, 9),
+]
+LONG_PASSAGES = ["Psalm 119:1-176", "Genesis 1:1-2:3", "John 14:1-15:27"]
+SUGGEST_QUERIES = ["jo", "gen 1", "ps 23:", "rom", "1 co", "Jhon"]
+WORDS = ["grace", "love", "faith", "light", "shepherd"]
+
+
+@dataclass
+class LoadRequest:
+    method: str
+    path: str
+    query: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    client_errors: int = 0
+    server_errors: int = 0
+    # Requests that got no response at all
+    failures: int = 0
+
+
+def synthetic_requests(
+    count: int, bible_versions: list[AcceptedVersion], seed: int = 0
+) -> Iterator[LoadRequest]:
+    """A mix of v1 and v2 requests: single verses, long passages, random and
+    daily verses, suggestions, reading, plans and the concordance.
+
+    Args:
+        count (int): number of requests.
+        bible_versions (list[AcceptedVersion]): versions to spread requests
+            over.
+        seed (int, optional): random seed. Defaults to 0.
+
+    Yields:
+        LoadRequest: requests to send.
+    """
+    rng = random.Random(seed)
+
+    def verse() -> LoadRequest:
+        book, chapter, _verse = rng.choice(REFERENCES)
+        return LoadRequest(
+            "GET",
+            "/api/v1/bible/verse",
+            {"reference": "{} {}:{}".format(book, chapter, _verse)},
+        )
+
+    def v2_verse() -> LoadRequest:
+        book, chapter, _verse = rng.choice(REFERENCES)
+        return LoadRequest(
+            "GET", "/api/v2/bible/{}/{}/{}".format(book, chapter, _verse)
+        )
+
+    def v2_reference() -> LoadRequest:
+        book, chapter, _verse = rng.choice(REFERENCES)
+        return LoadRequest(
+            "GET",
+            "/api/v2/bible/{} {}:{}-{}".format(
+                book, chapter, max(_verse - 2, 1), _verse
+            ),
+        )
+
+    mix = [
+        (20, verse),
+        (10, lambda: LoadRequest("GET", "/api/v1/bible/random-verse")),
+        (20, lambda: LoadRequest("GET", "/api/v1/bible/daily-verse")),
+        (15, v2_verse),
+        (10, v2_reference),
+        (
+            5,
+            lambda: LoadRequest(
+                "GET", "/api/v2/bible/{}".format(rng.choice(LONG_PASSAGES))
+            ),
+        ),
+        (
+            10,
+            lambda: LoadRequest(
+                "GET",
+                "/api/v2/bible/suggest",
+                {"q": rng.choice(SUGGEST_QUERIES)},
+            ),
+        ),
+        (
+            4,
+            lambda: LoadRequest(
+                "GET", "/api/v2/bible/read", {"from": "John 1:1", "limit": 50}
+            ),
+        ),
+        (
+            2,
+            lambda: LoadRequest(
+                "GET", "/api/v2/bible/plans", {"days": rng.choice([90, 365])}
+            ),
+        ),
+        (
+            4,
+            lambda: LoadRequest(
+                "GET",
+                "/api/v2/bible/concordance/{}".format(rng.choice(WORDS)),
+            ),
+        ),
+    ]
+    weights = [weight for weight, _ in mix]
+    builders = [builder for _, builder in mix]
+
+    for _ in range(count):
+        request = rng.choices(builders, weights)[0]()
+        request.query.setdefault(
+            "bible_version", rng.choice(bible_versions).value
+        )
+        yield request
+
+
+def logged_requests(path: Path) -> Iterator[LoadRequest]:
+    """Requests recorded as JSON lines of `method`, `path` and `query`, the
+    query being an object or a query string.
+
+    Args:
+        path (Path): JSONL file.
+
+    Yields:
+        LoadRequest: requests to send.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            query = record.get("query") or {}
+
+            if isinstance(query, str):
+                query = dict(httpx.QueryParams(query))
+
+            yield LoadRequest(
+                record.get("method", "GET").upper(), record["path"], query
+            )
+
+
+def route_template(method: str, path: str) -> str:
+    """Route a request path matches, eg `/api/v2/bible/{reference}`, so that
+    stats are grouped by route and not by URL.
+
+    Args:
+        method (str): HTTP method.
+        path (str): request path.
+
+    Returns:
+        str: path template of the matching route, or the path itself.
+    """
+    _path = unquote(path)
+
+    for prefix, router in ROUTERS:
+        if not _path.startswith(prefix + "/"):
+            continue
+
+        scope = {
+            "type": "http",
+            "path": _path[len(prefix) :],
+            "method": method,
+        }
+
+        for route in router.routes:
+            match, _ = route.matches(scope)
+
+            if match is Match.FULL:
+                template: str = route.path  # pyright:ignore[reportAttributeAccessIssue]
+                return prefix + template
+
+    return _path
+
+
+def percentile(latencies: list[float], share: float) -> float:
+    """Nearest rank percentile of sorted latencies."""
+    index = max(int(share * len(latencies) + 0.5) - 1, 0)
+    return latencies[min(index, len(latencies) - 1)]
+
+
+class Midnight:
+    """Stands in for `datetime.date` in `src.daily_verse` so that a run
+    crosses midnight: `today()` moves to the next day once `roll()` is
+    called.
+    """
+
+    offset = timedelta()
+
+    @classmethod
+    def today(cls) -> date:
+        return date.today() + cls.offset
+
+    @classmethod
+    def roll(cls) -> None:
+        cls.offset = timedelta(days=1)
+
+
+@contextmanager
+def midnight() -> Iterator[None]:
+    """Makes `src.daily_verse` use `Midnight` for the duration of a run, and
+    its storage save to a temporary file so the next day's verse doesn't
+    end up in the real DAILY_VERSE_FILE.
+    """
+    storage = daily_verse.DailyVerseStorage
+    # Name mangled class attribute shared by every storage instance
+    file_path = "_DailyVerseStorage__file_path"
+    saved_path: Path = getattr(storage, file_path)
+
+    with tempfile.TemporaryDirectory() as directory:
+        setattr(storage, file_path, Path(directory) / saved_path.name)
+        daily_verse.date = Midnight  # pyright:ignore[reportAttributeAccessIssue]
+
+        try:
+            yield
+        finally:
+            daily_verse.date = date  # pyright:ignore[reportAttributeAccessIssue]
+            setattr(storage, file_path, saved_path)
+            Midnight.offset = timedelta()
+
+
+async def run(
+    requests: list[LoadRequest],
+    client: httpx.AsyncClient,
+    concurrency: int,
+    rate: float | None,
+    on_halfway: Callable[[], None] | None = None,
+) -> tuple[dict[str, RouteStats], float]:
+    """Sends requests with a fixed number of workers.
+
+    Without a rate, workers send the next request as soon as they are done
+    (closed loop). With one, requests are due at a fixed arrival rate and
+    latency is counted from when a request was due, so a slow server is not
+    hidden by requests queueing up (open loop).
+
+    Args:
+        requests (list[LoadRequest]): requests to send.
+        client (httpx.AsyncClient): client to send them with.
+        concurrency (int): number of workers.
+        rate (float | None): requests per second, None for no limit.
+        on_halfway (Callable[[], None] | None, optional): called once half
+            of the requests are sent. Defaults to None.
+
+    Returns:
+        tuple[dict[str, RouteStats], float]: stats per route and wall time.
+    """
+    queue: asyncio.Queue[tuple[LoadRequest, float] | None] = asyncio.Queue()
+    stats: dict[str, RouteStats] = {}
+    start = time.perf_counter()
+
+    async def produce() -> None:
+        for index, request in enumerate(requests):
+            if index == len(requests) // 2 and on_halfway:
+                on_halfway()
+
+            due = time.perf_counter()
+
+            if rate:
+                due = start + index / rate
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+
+            await queue.put((request, due))
+
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            request, due = item
+            route = stats.setdefault(
+                "{} {}".format(
+                    request.method,
+                    route_template(request.method, request.path),
+                ),
+                RouteStats(),
+            )
+
+            if not rate:
+                due = time.perf_counter()
+
+            try:
+                response = await client.request(
+                    request.method, request.path, params=request.query
+                )
+            except httpx.HTTPError:
+                route.failures += 1
+                continue
+
+            route.latencies.append(time.perf_counter() - due)
+
+            if response.status_code >= 500:
+                route.server_errors += 1
+            elif response.status_code >= 400:
+                route.client_errors += 1
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+
+    return stats, time.perf_counter() - start
+
+
+def report(stats: dict[str, RouteStats], elapsed: float) -> str:
+    """Throughput, error rates and latency percentiles per route.
+
+    Args:
+        stats (dict[str, RouteStats]): stats per route.
+        elapsed (float): wall time of the run in seconds.
+
+    Returns:
+        str: report table.
+    """
+    row = "{:<48} {:>7} {:>6} {:>6} {:>8} {:>8} {:>8} {:>8}"
+    lines = [
+        row.format(
+            "route", "count", "4xx%", "err%", "p50 ms", "p90 ms", "p99 ms",
+            "max ms",
+        )
+    ]
+    total = 0
+
+    for name, route in sorted(stats.items()):
+        latencies = sorted(route.latencies)
+        count = len(latencies) + route.failures
+        total += count
+
+        # Server errors and requests without a response
+        errors = route.server_errors + route.failures
+
+        lines.append(
+            row.format(
+                name[:48],
+                count,
+                "{:.1f}".format(100 * route.client_errors / count),
+                "{:.1f}".format(100 * errors / count),
+                *(
+                    "{:.1f}".format(1000 * percentile(latencies, share))
+                    if latencies
+                    else "-"
+                    for share in (0.5, 0.9, 0.99, 1)
+                ),
+            )
+        )
+
+    lines.append(
+        "{} requests in {:.2f}s, {:.1f} req/s".format(
+            total, elapsed, total / elapsed if elapsed else 0
+        )
+    )
+
+    return "\n".join(lines)
+
+
+async def check_rollover(
+    client: httpx.AsyncClient, bible_versions: list[AcceptedVersion]
+) -> list[str]:
+    """After a run crossing midnight, every version's daily verse should be
+    the next day's and share one reference.
+
+    Args:
+        client (httpx.AsyncClient): client of the app.
+        bible_versions (list[AcceptedVersion]): versions used in the run.
+
+    Returns:
+        list[str]: problems found, empty if the rollover went right.
+    """
+    problems: list[str] = []
+    references: set[str] = set()
+    expected = Midnight.today().strftime("%a %b %d %Y")
+
+    for bible_version in bible_versions:
+        response = await client.get(
+            "/api/v1/bible/daily-verse",
+            params={"bible_version": bible_version.value},
+        )
+        verse = response.json()
+        references.add(verse["reference"])
+
+        if verse["day"] != expected:
+            problems.append(
+                "{} daily verse is for {}, not {}".format(
+                    bible_version.value, verse["day"], expected
+                )
+            )
+
+    if len(references) > 1:
+        problems.append(
+            "versions have different daily verses: {}".format(
+                ", ".join(sorted(references))
+            )
+        )
+
+    return problems
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    requests = list(
+        logged_requests(args.log)
+        if args.log
+        else synthetic_requests(args.requests, args.versions, args.seed)
+    )
+
+    if args.url:
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport()
+        base_url = args.url
+    else:
+        from src.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=args.timeout
+    ) as client:
+        if not args.midnight:
+            stats, elapsed = await run(
+                requests, client, args.concurrency, args.rate
+            )
+            print(report(stats, elapsed))
+
+            return 0
+
+        with midnight():
+            stats, elapsed = await run(
+                requests, client, args.concurrency, args.rate, Midnight.roll
+            )
+            print(report(stats, elapsed))
+
+            problems = await check_rollover(client, args.versions)
+
+    for problem in problems:
+        print("rollover: {}".format(problem), file=sys.stderr)
+
+    print("rollover: {}".format("FAILED" if problems else "OK"))
+
+    return 1 if problems else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest",
+        description="Replay recorded or synthetic traffic against the API.",
+    )
+    parser.add_argument(
+        "--log",
+        type=Path,
+        help="JSONL of {method, path, query} to replay instead of the "
+        "synthetic mix",
+    )
+    parser.add_argument(
+        "--url",
+        help="base URL of a running server, eg http://127.0.0.1:8000 "
+        "(default: the app in-process)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="synthetic requests to send (default: 2000)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="workers (default: 32)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="arrival rate in requests per second (default: no limit)",
+    )
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        type=AcceptedVersion,
+        default=[
+            AcceptedVersion.NIV_short,
+            AcceptedVersion.kJV_short,
+            AcceptedVersion.ASV_short,
+        ],
+        help="versions of the synthetic mix (default: NIV KJV ASV)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument(
+        "--midnight",
+        action="store_true",
+        help="move the daily verse's date to the next day halfway through "
+        "and check the rollover (in-process only)",
+    )
+    args = parser.parse_args()
+
+    if args.midnight and args.url:
+        parser.error("--midnight only works in-process")
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
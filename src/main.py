@@ -1,6 +1,10 @@
 from src.app import app
 from src.bible.router import bible_router
 from src.bible_v2.router import router as bible_router_v2
+from src.broadcast import daily_verse_broadcaster
+from src.registry import version_registry
+from src.runtime_metrics import runtime_monitor
+from src.service import verse_flight
 
 
 @app.get("/")
@@ -8,5 +12,20 @@ def root():
     return "Welcome to bible-api"
 
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "single_flight": verse_flight.stats(),
+        "version_registry": version_registry.stats(),
+        "daily_verse_stream": daily_verse_broadcaster.stats(),
+        "runtime": runtime_monitor.snapshot(),
+    }
+
+
+@app.get("/health/runtime")
+async def health_runtime():
+    return runtime_monitor.snapshot()
+
+
 app.include_router(bible_router, prefix="/api/v1")
 app.include_router(bible_router_v2, prefix="/api/v2")
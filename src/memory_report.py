@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from src.loadtest import run, synthetic_requests
+from src.schemas import AcceptedVersion
+from src.server import SERVER_VERSIONS
+
+# Fields of /proc/<pid>/smaps_rollup, in kB
+SMAPS_FIELDS = [
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+]
+
+READY_TIMEOUT_SECONDS = 600
+
+
+def memory(pid: int) -> dict[str, int]:
+    """Memory of a process from /proc/<pid>/smaps_rollup (Linux only).
+
+    USS (unique set size) is the memory only this process uses, what
+    freeing it would give back. PSS splits shared pages evenly between the
+    processes sharing them.
+
+    Args:
+        pid (int): process id.
+
+    Returns:
+        dict[str, int]: Rss, Pss, Uss and Shared in kB.
+    """
+    values: dict[str, int] = {}
+
+    rollup = Path("/proc/{}/smaps_rollup".format(pid)).read_text()
+
+    for line in rollup.splitlines():
+        name, _, value = line.partition(":")
+
+        if name in SMAPS_FIELDS:
+            values[name] = int(value.split()[0])
+
+    return {
+        "Rss": values["Rss"],
+        "Pss": values["Pss"],
+        "Uss": values["Private_Clean"] + values["Private_Dirty"],
+        "Shared": values["Shared_Clean"] + values["Shared_Dirty"],
+    }
+
+
+def children(pid: int) -> list[int]:
+    path = Path("/proc/{}/task/{}/children".format(pid, pid))
+    return [int(child) for child in path.read_text().split()]
+
+
+async def wait_ready(url: str) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+
+    async with httpx.AsyncClient(base_url=url) as client:
+        while True:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+
+            await asyncio.sleep(0.5)
+
+
+async def measure(
+    freeze: bool,
+    workers: int,
+    port: int,
+    requests: int,
+    bible_versions: list[AcceptedVersion],
+) -> list[tuple[str, dict[str, int]]]:
+    """Starts `src.server`, sends it synthetic traffic and reads the memory
+    of the parent and each worker.
+
+    Args:
+        freeze (bool): run the server with gc.freeze().
+        workers (int): number of workers.
+        port (int): port to serve on.
+        requests (int): requests to send before measuring.
+        bible_versions (list[AcceptedVersion]): versions to load and query.
+
+    Returns:
+        list[tuple[str, dict[str, int]]]: process name and its memory.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "src.server",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--versions",
+        *(bible_version.value for bible_version in bible_versions),
+    ]
+
+    if not freeze:
+        command.append("--no-freeze")
+
+    server = subprocess.Popen(command)
+    url = "http://127.0.0.1:{}".format(port)
+
+    try:
+        await wait_ready(url)
+
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            await run(
+                list(synthetic_requests(requests, bible_versions)),
+                client,
+                concurrency=workers * 4,
+                rate=None,
+            )
+
+        return [("parent", memory(server.pid))] + [
+            ("worker {}".format(index), memory(pid))
+            for index, pid in enumerate(children(server.pid), 1)
+        ]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def table(title: str, processes: list[tuple[str, dict[str, int]]]) -> str:
+    row = "{:<10} {:>10} {:>10} {:>10} {:>10}"
+    lines = [
+        title,
+        row.format("process", "RSS kB", "PSS kB", "USS kB", "shared kB"),
+    ]
+
+    for name, values in processes:
+        lines.append(
+            row.format(
+                name,
+                values["Rss"],
+                values["Pss"],
+                values["Uss"],
+                values["Shared"],
+            )
+        )
+
+    workers = [values for name, values in processes if name != "parent"]
+
+    if workers:
+        lines.append(
+            "per worker: {:.0f} kB USS, {:.0f} kB PSS; total PSS {} kB".format(
+                sum(values["Uss"] for values in workers) / len(workers),
+                sum(values["Pss"] for values in workers) / len(workers),
+                sum(values["Pss"] for _, values in processes),
+            )
+        )
+
+    return "\n".join(lines)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for freeze in (False, True):
+        processes = await measure(
+            freeze, args.workers, args.port, args.requests, args.versions
+        )
+        print(
+            table(
+                "with gc.freeze()" if freeze else "without gc.freeze()",
+                processes,
+            )
+        )
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.memory_report",
+        description="Compare worker memory of `python -m src.server` with "
+        "and without gc.freeze() (Linux only).",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="requests to send before measuring (default: 2000)",
+    )
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        type=AcceptedVersion,
+        default=SERVER_VERSIONS,
+        help="versions to load (default: NIV KJV ASV)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from collections.abc import Iterable, Iterator
+
+from pythonbible import (
+    Book,
+    get_book_number,
+    get_chapter_number,
+    get_verse_number,
+)
+
+from src.verse_table import CHAPTER_PLACE, verse_table
+
+
+def split_verse_id(verse_id: int) -> tuple[Book, int, int]:
+    """Splits a verse id into its book, chapter and verse.
+
+    Args:
+        verse_id (int): verse id to split.
+
+    Returns:
+        tuple[Book, int, int]: book, chapter and verse.
+    """
+    return (
+        Book(get_book_number(verse_id)),
+        get_chapter_number(verse_id),
+        get_verse_number(verse_id),
+    )
+
+
+def merge_verse_ranges(
+    ranges: Iterable[tuple[int, int]],
+) -> tuple[tuple[int, int], ...]:
+    """Sorts verse id ranges and merges the ones that overlap or touch.
+
+    Args:
+        ranges (Iterable[tuple[int, int]]): inclusive (start, end) verse id
+            ranges, each within a single book.
+
+    Returns:
+        tuple[tuple[int, int], ...]: sorted, non overlapping ranges.
+    """
+    merged: list[tuple[int, int]] = []
+
+    for start, end in sorted(ranges):
+        if merged:
+            last_start, last_end = merged[-1]
+            following = verse_table.next_verse_id(last_end)
+
+            if start <= last_end or start == following:
+                merged[-1] = (last_start, max(last_end, end))
+                continue
+
+        merged.append((start, end))
+
+    return tuple(merged)
+
+
+class Passage:
+    """A reference resolved into sorted, merged verse id ranges"""
+
+    def __init__(self, ranges: Iterable[tuple[int, int]]) -> None:
+        self.__ranges = merge_verse_ranges(ranges)
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        return self.__ranges
+
+    @property
+    def key(self) -> str:
+        """Canonical cache key made of the verse id ranges, eg
+        `43003016-43003018,45005008`. Every spelling of the same passage
+        has the same key."""
+
+        return ",".join(
+            "{}-{}".format(start, end) if start != end else "{}".format(start)
+            for start, end in self.__ranges
+        )
+
+    @property
+    def verse_count(self) -> int:
+        return sum(
+            verse_table.count_verses(start, end)
+            for start, end in self.__ranges
+        )
+
+    @property
+    def reference(self) -> str:
+        """The passage formatted as its canonical reference, eg
+        `John 3:16, 18; Romans 5:8`"""
+
+        reference = ""
+        previous_book: Book | None = None
+        previous_chapter: int | None = None
+
+        for start, end in self.__ranges:
+            book, start_chapter, start_verse = split_verse_id(start)
+            _, end_chapter, end_verse = split_verse_id(end)
+
+            if book is not previous_book:
+                if reference:
+                    reference += "; "
+                reference += "{} {}:{}".format(
+                    book.title, start_chapter, start_verse
+                )
+            elif start_chapter != previous_chapter:
+                reference += ", {}:{}".format(start_chapter, start_verse)
+            else:
+                reference += ", {}".format(start_verse)
+
+            if end_chapter != start_chapter:
+                reference += "-{}:{}".format(end_chapter, end_verse)
+            elif end_verse != start_verse:
+                reference += "-{}".format(end_verse)
+
+            previous_book, previous_chapter = book, end_chapter
+
+        return reference
+
+    def verse_ids(self) -> Iterator[int]:
+        """Walks every verse id of the passage in reading order.
+
+        Yields:
+            int: verse ids.
+        """
+        for start, end in self.__ranges:
+            yield from verse_table.iter_verse_ids(start, end)
+
+    def chapters(self) -> Iterator[list[int]]:
+        """Walks the passage one chapter at a time.
+
+        Yields:
+            list[int]: verse ids of the passage that fall in one chapter.
+        """
+        chapter: list[int] = []
+
+        for verse_id in self.verse_ids():
+            # Dropping the verse digits leaves the book and chapter.
+            if chapter and (
+                verse_id // CHAPTER_PLACE != chapter[-1] // CHAPTER_PLACE
+            ):
+                yield chapter
+                chapter = []
+
+            chapter.append(verse_id)
+
+        if chapter:
+            yield chapter
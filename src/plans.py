@@ -0,0 +1,146 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from functools import lru_cache
+
+from pythonbible import Version
+
+from src.exceptions import InvalidArgumentsError
+from src.passages import Passage
+from src.schemas import AcceptedBookGroup, PlanBalance
+from src.service import get_verse_texts
+from src.utils import plan_books
+from src.verse_table import verse_table
+
+
+@lru_cache
+def character_prefix(bible_version: Version) -> array:
+    """Prefix sums of verse lengths in characters over the whole Bible.
+    Computed once per version, verses missing from the version count as 0.
+
+    Args:
+        bible_version (Version): Bible version to measure.
+
+    Returns:
+        array: `prefix[ordinal]` is the number of characters before the
+            verse at that ordinal.
+    """
+    verse_ids = list(
+        verse_table.iter_verse_ids(
+            verse_table.verse_id(0),
+            verse_table.verse_id(verse_table.total_verses - 1),
+        )
+    )
+
+    prefix = array("Q", [0])
+
+    for text in get_verse_texts(verse_ids, bible_version):
+        prefix.append(prefix[-1] + len(text or ""))
+
+    return prefix
+
+
+@lru_cache(maxsize=256)
+def reading_plan(
+    book_group: AcceptedBookGroup,
+    bible_version: Version,
+    days: int,
+    balance: PlanBalance = PlanBalance.VERSES,
+) -> tuple[tuple[str, int], ...]:
+    """Splits a group of books into contiguous daily portions of about the
+    same size.
+
+    Each day's end is found by bisecting prefix sums of the verse (or
+    character) counts, so the cost grows with the number of days and not
+    with the size of the group.
+
+    Args:
+        book_group (AcceptedBookGroup): group of books to read.
+        bible_version (Version): Bible version to read.
+        days (int): number of portions.
+        balance (PlanBalance, optional): balance portions by number of verses
+            or characters. Defaults to PlanBalance.VERSES.
+
+    Raises:
+        InvalidArgumentsError: Raised if the version has none of the books.
+        InvalidArgumentsError: Raised if there are more days than verses.
+
+    Returns:
+        tuple[tuple[str, int], ...]: reference and number of verses of each
+        day's portion.
+    """
+    books = plan_books(book_group, bible_version)
+
+    if not books:
+        raise InvalidArgumentsError(
+            "{} has no {} books".format(bible_version.title, book_group.value)
+        )
+
+    prefix: Sequence[int] = (
+        character_prefix(bible_version)
+        if balance is PlanBalance.CHARACTERS
+        else range(verse_table.total_verses + 1)
+    )
+
+    # Each book is a span of ordinals. verses_before and weight_before hold
+    # the verses and weight of the group before each book, plus the totals.
+    spans = [verse_table.book_ordinals(book) for book in books]
+    verses_before, weight_before = [0], [0]
+
+    for start, end in spans:
+        verses_before.append(verses_before[-1] + end - start)
+        weight_before.append(weight_before[-1] + prefix[end] - prefix[start])
+
+    total_verses, total_weight = verses_before[-1], weight_before[-1]
+
+    if days > total_verses:
+        raise InvalidArgumentsError(
+            "cannot split {} verses into {} days".format(total_verses, days)
+        )
+
+    # Position (counted in verses of the group) where each day ends
+    ends: list[int] = []
+
+    for day in range(1, days):
+        target = total_weight * day / days
+        index = max(bisect_right(weight_before, target) - 1, 0)
+        start, end = spans[min(index, len(spans) - 1)]
+
+        ordinal = bisect_left(
+            prefix,
+            prefix[start] + target - weight_before[index],
+            start,
+            end,
+        )
+        position = verses_before[index] + ordinal - start
+
+        # Every day gets at least one verse
+        previous = ends[-1] if ends else 0
+        ends.append(
+            min(max(position, previous + 1), total_verses - (days - day))
+        )
+
+    ends.append(total_verses)
+
+    portions: list[tuple[str, int]] = []
+    position = 0
+
+    for end in ends:
+        ranges: list[tuple[int, int]] = []
+
+        # Split the day's positions by book, each book being one range.
+        while position < end:
+            index = bisect_right(verses_before, position) - 1
+            start, book_end = spans[index]
+            first = start + position - verses_before[index]
+            last = min(book_end, start + end - verses_before[index]) - 1
+
+            ranges.append(
+                (verse_table.verse_id(first), verse_table.verse_id(last))
+            )
+            position += last - first + 1
+
+        passage = Passage(ranges)
+        portions.append((passage.reference, passage.verse_count))
+
+    return tuple(portions)
@@ -0,0 +1,204 @@
+import cProfile
+import hmac
+import io
+import itertools
+import pstats
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, parse_qsl, urlencode
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.constants import (
+    PROFILE_DIR,
+    PROFILE_MAX_FILES,
+    PROFILE_MIN_INTERVAL_SECONDS,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_SECRET,
+)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "profile"
+
+# Lines of the report listing the most expensive functions
+REPORT_LIMIT = 40
+
+
+def profiling_enabled() -> bool:
+    return bool(PROFILE_SECRET) or PROFILE_SAMPLE_RATE > 0
+
+
+def should_profile(scope: dict[str, Any], sample: bool = True) -> bool:
+    """Check if a request asked to be profiled with the secret, or was
+    picked by the sample rate.
+
+    Args:
+        scope (dict[str, Any]): ASGI scope of the request.
+        sample (bool, optional): whether sampling may pick the request.
+            Defaults to True.
+
+    Returns:
+        bool: True if the request should be profiled.
+    """
+    if PROFILE_SECRET:
+        secrets = [
+            value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name == PROFILE_HEADER
+        ]
+        secrets.extend(
+            parse_qs(scope["query_string"].decode("latin-1")).get(
+                PROFILE_QUERY, []
+            )
+        )
+
+        if any(
+            hmac.compare_digest(secret.encode(), PROFILE_SECRET.encode())
+            for secret in secrets
+        ):
+            return True
+
+    return sample and random.random() < PROFILE_SAMPLE_RATE
+
+
+def write_profile(
+    profile: cProfile.Profile, name: str, summary: str
+) -> None:
+    """Writes a profile as `<name>.prof`, for pstats or snakeviz, and a text
+    report `<name>.txt` with the most expensive functions and what the
+    app's own functions called.
+
+    Args:
+        profile (cProfile.Profile): finished profile.
+        name (str): file name without extension.
+        summary (str): first line of the report.
+    """
+    directory = Path(PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profile.dump_stats(directory / "{}.prof".format(name))
+
+    report = io.StringIO()
+    report.write(summary + "\n\n")
+
+    stats = pstats.Stats(profile, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(REPORT_LIMIT)
+    stats.print_callees(r"/src/")
+
+    (directory / "{}.txt".format(name)).write_text(report.getvalue())
+
+    rotate_profiles(directory)
+
+
+def rotate_profiles(directory: Path) -> None:
+    """Deletes the oldest profiles past PROFILE_MAX_FILES, with their text
+    reports.
+
+    Args:
+        directory (Path): directory profiles are written to.
+    """
+    profiles: list[tuple[float, Path]] = []
+
+    for path in directory.glob("*.prof"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            # Deleted by another worker
+            continue
+
+    profiles.sort()
+
+    for _, path in profiles[: max(len(profiles) - PROFILE_MAX_FILES, 0)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".txt").unlink(missing_ok=True)
+
+
+class ProfileMiddleware:
+    """Runs selected requests under cProfile.
+
+    Since Python 3.12 a profiler sees every thread, so the profile covers
+    the sync dependencies and service calls run in the threadpool as well as
+    routing and serialization. It also means only one request is profiled
+    at a time, and that work of other requests served meanwhile shows up in
+    it. Only installed when profiling is configured, so there is no cost
+    otherwise.
+
+    Sampled profiles are at least PROFILE_MIN_INTERVAL_SECONDS apart, and
+    only the last PROFILE_MAX_FILES profiles are kept, so sampling a busy
+    worker cannot fill the disk.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.__busy = False
+        self.__counter = itertools.count(1)
+        self.__next_sample: float = 0
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any):
+        if (
+            scope["type"] != "http"
+            or self.__busy
+            or not should_profile(
+                scope, sample=time.monotonic() >= self.__next_sample
+            )
+        ):
+            return await self.app(scope, receive, send)
+
+        name = "{}-{}-{}-{}".format(
+            time.strftime("%Y%m%d-%H%M%S"),
+            next(self.__counter),
+            scope["method"],
+            re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:80],
+        )
+        status: list[int] = []
+
+        async def send_with_profile_id(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", name.encode()),
+                ]
+
+            await send(message)
+
+        profile = cProfile.Profile()
+
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (eg a debugger) is active
+            return await self.app(scope, receive, send)
+
+        self.__busy = True
+        self.__next_sample = time.monotonic() + PROFILE_MIN_INTERVAL_SECONDS
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.disable()
+            self.__busy = False
+
+            # Without the secret
+            query = urlencode(
+                [
+                    (key, value)
+                    for key, value in parse_qsl(
+                        scope["query_string"].decode("latin-1")
+                    )
+                    if key != PROFILE_QUERY
+                ]
+            )
+            summary = "{} {}?{} -> {} in {:.1f} ms".format(
+                scope["method"],
+                scope["path"],
+                query,
+                status[0] if status else "no response",
+                (time.perf_counter() - start) * 1000,
+            )
+            await run_in_threadpool(write_profile, profile, name, summary)
@@ -0,0 +1,330 @@
+import json
+import logging
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from pathlib import Path
+
+from pythonbible import Book
+
+from src.constants import BIBLE_DATA_DIR, BIBLE_MEMORY_BUDGET_MB
+from src.schemas import AcceptedVersion
+from src.verse_table import BOOK_PLACE, CHAPTER_PLACE, verse_table
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVersion:
+    """Text of a version loaded from a local file.
+
+    Held as sorted verse ids, offsets and one UTF-8 blob instead of a str
+    per verse, so a whole Bible costs about its text size plus 8 bytes a
+    verse. Row i's text is `__text[__offsets[i]:__offsets[i + 1]]`.
+
+    A file is `<ID>.jsonl`: a header line `{"title": "..."}` followed by one
+    `{"verse_id": 43003016, "text": "..."}` line per verse, which is also
+    what `python -m src.corpus` writes after the header.
+    """
+
+    def __init__(self, version_id: str, path: Path) -> None:
+        """Reads a version file.
+
+        Args:
+            version_id (str): id of the version.
+            path (Path): the `<ID>.jsonl` file.
+
+        Raises:
+            ValueError: Raised if the file is not a valid version file.
+        """
+        self.version_id = version_id
+        self.title = read_title(path)
+        verses: list[tuple[int, bytes]] = []
+
+        with open(path, encoding="utf-8") as file:
+            file.readline()
+
+            for number, line in enumerate(file, 2):
+                if not line.strip():
+                    continue
+
+                try:
+                    verse = json.loads(line)
+                    verse_id = verse["verse_id"]
+                    text = verse["text"]
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(
+                        "{}:{}: invalid verse line ({})".format(
+                            path, number, e
+                        )
+                    )
+
+                if not is_valid_verse_id(verse_id):
+                    raise ValueError(
+                        "{}:{}: invalid verse id {}".format(
+                            path, number, verse_id
+                        )
+                    )
+
+                # A null text is a verse missing from the version
+                if text is None:
+                    continue
+
+                if not isinstance(text, str):
+                    raise ValueError(
+                        "{}:{}: invalid verse text".format(path, number)
+                    )
+
+                verses.append((verse_id, text.encode()))
+
+        verses.sort(key=lambda verse: verse[0])
+
+        self.__ids = array("I", (verse_id for verse_id, _ in verses))
+        self.__offsets = array("I", [0])
+        offset = 0
+
+        for _, text in verses:
+            offset += len(text)
+            self.__offsets.append(offset)
+
+        self.__text = b"".join(text for _, text in verses)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self.__text)
+            + self.__ids.itemsize * len(self.__ids)
+            + self.__offsets.itemsize * len(self.__offsets)
+        )
+
+    @property
+    def verse_count(self) -> int:
+        return len(self.__ids)
+
+    def verse_texts(self, start: int, end: int) -> list[tuple[int, str]]:
+        """Verses this version has from start to end (inclusive).
+
+        Args:
+            start (int): first verse id.
+            end (int): last verse id.
+
+        Returns:
+            list[tuple[int, str]]: verse ids and text in reading order.
+        """
+        first = bisect_left(self.__ids, start)
+        last = bisect_right(self.__ids, end)
+
+        return [
+            (
+                self.__ids[i],
+                self.__text[
+                    self.__offsets[i] : self.__offsets[i + 1]
+                ].decode(),
+            )
+            for i in range(first, last)
+        ]
+
+
+def read_title(path: Path) -> str:
+    """Reads the title from the header line of a version file.
+
+    Args:
+        path (Path): the `<ID>.jsonl` file.
+
+    Raises:
+        ValueError: Raised if the header is not `{"title": "..."}`.
+
+    Returns:
+        str: title of the version.
+    """
+    with open(path, encoding="utf-8") as file:
+        header = file.readline()
+
+    try:
+        title = json.loads(header)["title"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("{}:1: invalid header ({})".format(path, e))
+
+    if not isinstance(title, str):
+        raise ValueError("{}:1: invalid title".format(path))
+
+    return title
+
+
+def is_valid_verse_id(verse_id: object) -> bool:
+    if not isinstance(verse_id, int) or verse_id <= 0:
+        return False
+
+    try:
+        book = Book(verse_id // BOOK_PLACE)
+    except ValueError:
+        return False
+
+    return verse_table.is_valid_verse(
+        book, verse_id % BOOK_PLACE // CHAPTER_PLACE, verse_id % CHAPTER_PLACE
+    )
+
+
+class VersionRegistry:
+    """Versions found as `<ID>.jsonl` files in a data directory.
+
+    A version is only read on first use. Loaded versions are kept most
+    recently used last, and the least recently used ones are dropped once
+    they take more than the memory budget, so having many files does not
+    mean holding them all in every worker. The last used version is always
+    kept even if it is larger than the budget on its own.
+
+    Files that cannot be read as a version are logged and treated as
+    missing, so one bad file doesn't break the others.
+    """
+
+    def __init__(self, data_dir: Path, budget: int) -> None:
+        self.__data_dir = data_dir
+        self.__budget = budget
+        self.__loaded: OrderedDict[str, LocalVersion] = OrderedDict()
+        # Guards `__loaded` and the counters, never held while reading a file
+        self.__lock = threading.Lock()
+        # One lock per version id, held while that version is read so
+        # concurrent first uses read it once
+        self.__loading: dict[str, threading.Lock] = {}
+        self.__loads: int = 0
+        self.__evictions: int = 0
+
+    def paths(self) -> dict[str, Path]:
+        """Version files in the data directory. Ids of the bundled versions
+        are left out so they cannot be shadowed.
+
+        Returns:
+            dict[str, Path]: version id to file.
+        """
+        if not self.__data_dir.is_dir():
+            return {}
+
+        bundled = {version.value for version in AcceptedVersion}
+
+        return {
+            path.stem.upper(): path
+            for path in sorted(self.__data_dir.glob("*.jsonl"))
+            if path.stem.upper() not in bundled
+        }
+
+    def versions(self) -> list[tuple[str, str, bool]]:
+        """Every valid version in the data directory. Only the header line
+        of the versions not loaded is read.
+
+        Returns:
+            list[tuple[str, str, bool]]: version id, title and whether the
+            version is loaded.
+        """
+        versions: list[tuple[str, str, bool]] = []
+
+        with self.__lock:
+            loaded = dict(self.__loaded)
+
+        for version_id, path in self.paths().items():
+            version = loaded.get(version_id)
+
+            if version is not None:
+                versions.append((version_id, version.title, True))
+                continue
+
+            try:
+                title = read_title(path)
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping version file: {}".format(e))
+                continue
+
+            versions.append((version_id, title, False))
+
+        return versions
+
+    def get(self, version_id: str) -> LocalVersion | None:
+        """Gets a version, loading it on first use.
+
+        Args:
+            version_id (str): id of the version, its file name without the
+                extension.
+
+        Returns:
+            LocalVersion | None: the version, or None if there's no file for
+            it.
+        """
+        _version_id = version_id.upper()
+
+        with self.__lock:
+            version = self.__use(_version_id)
+
+        if version is not None:
+            return version
+
+        path = self.paths().get(_version_id)
+
+        if path is None:
+            return None
+
+        with self.__lock:
+            loading = self.__loading.setdefault(_version_id, threading.Lock())
+
+        with loading:
+            # Read by another request while this one waited
+            with self.__lock:
+                version = self.__use(_version_id)
+
+            if version is not None:
+                return version
+
+            try:
+                version = LocalVersion(_version_id, path)
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping version file: {}".format(e))
+                return None
+
+            with self.__lock:
+                self.__loaded[_version_id] = version
+                self.__loads += 1
+
+                while (
+                    len(self.__loaded) > 1
+                    and self.__resident_bytes() > self.__budget
+                ):
+                    self.__loaded.popitem(last=False)
+                    self.__evictions += 1
+
+            return version
+
+    def __use(self, version_id: str) -> LocalVersion | None:
+        version = self.__loaded.get(version_id)
+
+        if version is not None:
+            self.__loaded.move_to_end(version_id)
+
+        return version
+
+    def __resident_bytes(self) -> int:
+        return sum(version.nbytes for version in self.__loaded.values())
+
+    @property
+    def resident_bytes(self) -> int:
+        with self.__lock:
+            return self.__resident_bytes()
+
+    def stats(self) -> dict[str, int | list[str]]:
+        """Counters describing the loaded versions.
+
+        Returns:
+            dict[str, int | list[str]]: loaded versions (least recently used
+                first), their size, the budget, loads and evictions.
+        """
+        with self.__lock:
+            return {
+                "loaded": list(self.__loaded),
+                "resident_bytes": self.__resident_bytes(),
+                "budget_bytes": self.__budget,
+                "loads": self.__loads,
+                "evictions": self.__evictions,
+            }
+
+
+version_registry = VersionRegistry(
+    Path(BIBLE_DATA_DIR), BIBLE_MEMORY_BUDGET_MB * 1024 * 1024
+)
@@ -0,0 +1,199 @@
+import asyncio
+import gc
+import time
+from collections import deque
+from typing import Any
+
+from anyio.to_thread import current_default_thread_limiter
+
+# How often the event loop lag is sampled
+SAMPLE_INTERVAL_SECONDS = 0.5
+
+# Number of recent samples (and GC pauses) kept for the percentiles
+WINDOW = 120
+
+# Responses that stay open idle for their whole life, counted as streams
+# instead of requests in flight once their headers are sent
+STREAM_MEDIA_TYPES = (b"text/event-stream",)
+
+
+def percentile(samples: list[float], share: float) -> float:
+    """Nearest rank percentile of unsorted samples, 0 if there are none."""
+    if not samples:
+        return 0
+
+    _samples = sorted(samples)
+    index = max(int(share * len(_samples) + 0.5) - 1, 0)
+
+    return _samples[min(index, len(_samples) - 1)]
+
+
+class RuntimeMonitor:
+    """Samples how saturated the process is.
+
+    - Event loop lag: how late a sleep of SAMPLE_INTERVAL_SECONDS wakes up,
+      which grows when something blocks the loop.
+    - GC pauses: time between the `start` and `stop` phases of every
+      collection, from `gc.callbacks`.
+    - Threadpool: busy and waiting tasks of anyio's default limiter, which
+      runs the sync dependencies and routes.
+    - Requests in flight, counted by `RuntimeMiddleware`. Open event
+      streams (the daily verse SSE) are counted apart, as `streams`, so
+      idle listeners don't read as saturation.
+
+    Sampling starts with the first request, the GC callback with it, and
+    both run until `stop`.
+    """
+
+    def __init__(self) -> None:
+        self.__task: asyncio.Task[None] | None = None
+        self.__lags: deque[float] = deque(maxlen=WINDOW)
+        self.__max_lag: float = 0
+        self.__threadpool: dict[str, int] = {}
+
+        self.__gc_start: float | None = None
+        self.__gc_pauses: deque[float] = deque(maxlen=WINDOW)
+        self.__gc_collections = [0, 0, 0]
+        self.__gc_total: float = 0
+        self.__gc_max: float = 0
+
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.streams: int = 0
+
+    def start(self) -> None:
+        """Starts sampling on the running event loop, if not started yet."""
+        if self.__task is not None and not self.__task.done():
+            return
+
+        if self.__on_gc not in gc.callbacks:
+            gc.callbacks.append(self.__on_gc)
+
+        self.__task = asyncio.ensure_future(self.__sample())
+
+    def stop(self) -> None:
+        """Stops sampling and removes the GC callback."""
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+        if self.__on_gc in gc.callbacks:
+            gc.callbacks.remove(self.__on_gc)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current runtime metrics.
+
+        Returns:
+            dict[str, Any]: loop lag, GC pauses (in ms), threadpool usage,
+                requests in flight and open streams.
+        """
+        lags = list(self.__lags)
+        pauses = list(self.__gc_pauses)
+
+        return {
+            "loop_lag_ms": {
+                "last": round(1000 * lags[-1], 3) if lags else 0,
+                "p99": round(1000 * percentile(lags, 0.99), 3),
+                "max": round(1000 * self.__max_lag, 3),
+            },
+            "gc": {
+                "collections": list(self.__gc_collections),
+                "pause_total_ms": round(1000 * self.__gc_total, 3),
+                "pause_p99_ms": round(1000 * percentile(pauses, 0.99), 3),
+                "pause_max_ms": round(1000 * self.__gc_max, 3),
+            },
+            "threadpool": dict(self.__threadpool),
+            "requests": {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "streams": self.streams,
+            },
+        }
+
+    async def __sample(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(SAMPLE_INTERVAL_SECONDS)
+
+            lag = max(
+                time.perf_counter() - start - SAMPLE_INTERVAL_SECONDS, 0
+            )
+            self.__lags.append(lag)
+            self.__max_lag = max(self.__max_lag, lag)
+
+            statistics = current_default_thread_limiter().statistics()
+            self.__threadpool = {
+                "busy": statistics.borrowed_tokens,
+                "size": int(statistics.total_tokens),
+                "waiting": statistics.tasks_waiting,
+            }
+
+    def __on_gc(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self.__gc_start = time.perf_counter()
+            return
+
+        if self.__gc_start is None:
+            return
+
+        pause = time.perf_counter() - self.__gc_start
+        self.__gc_start = None
+
+        self.__gc_pauses.append(pause)
+        self.__gc_collections[info["generation"]] += 1
+        self.__gc_total += pause
+        self.__gc_max = max(self.__gc_max, pause)
+
+
+class RuntimeMiddleware:
+    """Counts requests in flight and starts the monitor on the first one.
+
+    A request whose response turns out to be an event stream moves from the
+    requests in flight to the streams when its headers are sent.
+    """
+
+    def __init__(self, app: Any, monitor: RuntimeMonitor | None = None):
+        self.app = app
+        # The process-wide monitor unless another one is given
+        self.monitor = monitor or runtime_monitor
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        monitor = self.monitor
+        monitor.start()
+        monitor.in_flight += 1
+        monitor.max_in_flight = max(monitor.max_in_flight, monitor.in_flight)
+        stream = False
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal stream
+
+            if message["type"] == "http.response.start" and is_stream(
+                message
+            ):
+                stream = True
+                monitor.in_flight -= 1
+                monitor.streams += 1
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if stream:
+                monitor.streams -= 1
+            else:
+                monitor.in_flight -= 1
+
+
+def is_stream(message: dict[str, Any]) -> bool:
+    for name, value in message.get("headers", []):
+        if name.lower() == b"content-type":
+            return value.split(b";")[0].strip() in STREAM_MEDIA_TYPES
+
+    return False
+
+
+runtime_monitor = RuntimeMonitor()
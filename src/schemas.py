@@ -61,6 +61,11 @@ class AcceptedBookGroup(StrEnum):
         return MAPPED_BOOK_GROUPS[self.value]
 
 
+class PlanBalance(StrEnum):
+    VERSES = "verses"
+    CHARACTERS = "characters"
+
+
 class VerseResponse(BaseModel):
     reference: str
     verse_text: list[str]
@@ -68,6 +73,76 @@ class VerseResponse(BaseModel):
     bible_version: str
 
 
+class ComparedVerse(BaseModel):
+    verse_id: int
+    chapter: int
+    verse: int
+    verse_text: dict[str, str | None]
+    missing_from: list[str]
+
+
+class CompareResponse(BaseModel):
+    reference: str
+    bible_versions: list[str]
+    verses: list[ComparedVerse]
+
+
+class ReadVerse(BaseModel):
+    verse_id: int
+    reference: str
+    verse_text: str | None
+
+
+class ReadResponse(BaseModel):
+    bible_version: str
+    verses: list[ReadVerse]
+    next_cursor: str | None
+
+
+class PlanPortion(BaseModel):
+    day: int
+    reference: str
+    verse_count: int
+
+
+class PlanResponse(BaseModel):
+    book_group: AcceptedBookGroup
+    bible_version: str
+    balance: PlanBalance
+    days: list[PlanPortion]
+
+
+class ConcordanceVerse(BaseModel):
+    verse_id: int
+    reference: str
+    count: int
+
+
+class ConcordanceResponse(BaseModel):
+    word: str
+    book_group: AcceptedBookGroup
+    bible_version: str
+    total: int
+    books: dict[str, int]
+    verses: list[ConcordanceVerse]
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: list[str]
+
+
+class LocalVersionInfo(BaseModel):
+    version_id: str
+    title: str
+    loaded: bool
+
+
+class VersionsResponse(BaseModel):
+    bundled: list[str]
+    local: list[LocalVersionInfo]
+
+
 class DailyVerse(BaseModel):
     reference: str
     verse_text: list[str]
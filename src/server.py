@@ -0,0 +1,202 @@
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from src.schemas import AcceptedBookGroup, AcceptedVersion, PlanBalance
+
+SERVER_VERSIONS = [
+    AcceptedVersion.NIV_short,
+    AcceptedVersion.kJV_short,
+    AcceptedVersion.ASV_short,
+]
+
+# A worker dying sooner than this after its start is not restarted again
+# right away, to avoid a fork loop when something is broken
+MIN_WORKER_SECONDS = 1
+
+
+def preload(bible_versions: list[AcceptedVersion]) -> None:
+    """Builds every lookup table and cache workers would otherwise build on
+    their first requests: the verse tables, book name trie and n-grams
+    (built on import), each version's text in both the forms pythonbible
+    keeps it, concordance and character counts, and the daily verse.
+
+    Args:
+        bible_versions (list[AcceptedVersion]): versions to load.
+    """
+    import pythonbible as bible
+
+    from src.concordance import get_concordance
+    from src.plans import character_prefix, reading_plan
+    from src.service import get_daily_verse, get_parsed_verse
+
+    for bible_version in bible_versions:
+        _bible_version = bible_version.pythonbible_version()
+
+        bible.get_verse_text(1001001, version=_bible_version)
+        # Formatted text, a separate copy only loaded by format_scripture_text
+        get_parsed_verse("Genesis 1:1", bible_version)
+        get_concordance(_bible_version)
+        character_prefix(_bible_version)
+        # Same arguments as the plan route's defaults, so the entry is hit
+        reading_plan(
+            AcceptedBookGroup.ANY, _bible_version, 365, PlanBalance.VERSES
+        )
+        get_daily_verse(bible_version)
+
+
+def listen(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+
+    return sock
+
+
+def serve(sock: socket.socket, log_level: str) -> None:
+    """Runs one worker on the shared socket. Never returns.
+
+    Args:
+        sock (socket.socket): listening socket shared by all workers.
+        log_level (str): uvicorn log level.
+    """
+    from src.main import app
+
+    # Forked workers would otherwise draw the same random verses
+    random.seed()
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+    os._exit(0)
+
+
+def spawn(sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+
+    if pid == 0:
+        try:
+            serve(sock, log_level)
+        finally:
+            os._exit(1)
+
+    return pid
+
+
+def supervise(sock: socket.socket, workers: int, log_level: str) -> None:
+    """Forks the workers and restarts the ones that die until the parent
+    gets SIGINT or SIGTERM, then stops them all.
+
+    Args:
+        sock (socket.socket): listening socket shared by all workers.
+        workers (int): number of workers.
+        log_level (str): uvicorn log level.
+    """
+    started = {
+        spawn(sock, log_level): time.monotonic() for _ in range(workers)
+    }
+    stopping = False
+
+    def stop(signum: int, frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+
+        for pid in started:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while started:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+
+        start = started.pop(pid, None)
+
+        if stopping or start is None:
+            continue
+
+        print(
+            "worker {} exited with status {}".format(
+                pid, os.waitstatus_to_exitcode(status)
+            ),
+            file=sys.stderr,
+        )
+
+        if time.monotonic() - start < MIN_WORKER_SECONDS:
+            time.sleep(MIN_WORKER_SECONDS)
+
+        started[spawn(sock, log_level)] = time.monotonic()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server",
+        description="Load the app once, freeze it and fork workers that "
+        "share its memory.",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of workers (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        type=AcceptedVersion,
+        default=SERVER_VERSIONS,
+        help="versions to preload (default: NIV KJV ASV)",
+    )
+    parser.add_argument(
+        "--no-freeze",
+        action="store_true",
+        help="skip gc.freeze(), to compare memory use",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    import src.main  # noqa: F401
+
+    preload(args.versions)
+
+    if not args.no_freeze:
+        # Garbage left by loading is collected first so the workers don't
+        # inherit it, then the rest is moved out of the collector's reach
+        # so collections in the workers don't write to (and so copy) the
+        # pages they share with the parent. Measured with memory_report,
+        # this gives less memory per worker than not freezing, while
+        # keeping the collector off during loading (as the gc docs suggest)
+        # gives more.
+        gc.collect()
+        gc.freeze()
+
+    sock = listen(args.host, args.port)
+    print(
+        "serving on {}:{} with {} workers (pid {})".format(
+            args.host, args.port, args.workers, os.getpid()
+        ),
+        file=sys.stderr,
+    )
+
+    supervise(sock, args.workers, args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
+import asyncio
+
 import pythonbible as bible
+from fastapi.concurrency import run_in_threadpool
 
 from src.bible import daily_verse_storage
+from src.passages import Passage
 from src.schemas import AcceptedBookGroup, AcceptedVersion, DailyVerse
-from src.utils import get_book, random_reference
+from src.single_flight import SingleFlight
+from src.utils import encode_cursor, get_book, random_reference
+from src.verse_table import BOOK_PLACE, verse_table
+
+verse_flight = SingleFlight()
 
 
 def get_verse_text(verse: str, bible_version: bible.Version):
@@ -17,6 +25,67 @@ def get_verse_text(verse: str, bible_version: bible.Version):
     return text
 
 
+def get_verse_texts(
+    verse_ids: list[int], bible_version: bible.Version
+) -> list[str | None]:
+    """Gets the text of each verse id in the given version.
+
+    Args:
+        verse_ids (list[int]): verse ids to look up.
+        bible_version (bible.Version): Bible version to use.
+
+    Returns:
+        list[str | None]: text aligned with verse_ids. None where the verse's
+            book is not part of the version or the version has no text for it.
+    """
+    texts: list[str | None] = []
+
+    for verse_id in verse_ids:
+        book = bible.Book(bible.get_book_number(verse_id))
+
+        if not verse_table.has_book(bible_version, book):
+            texts.append(None)
+            continue
+
+        text = bible.get_verse_text(verse_id, version=bible_version)
+        texts.append(text or None)
+
+    return texts
+
+
+async def compare_verse_texts(
+    passage: Passage, bible_versions: list[AcceptedVersion]
+) -> tuple[list[int], dict[bible.Version, list[str | None]]]:
+    """Looks up one passage in several versions concurrently.
+
+    The passage is walked into verse ids once and every version reads
+    the same id list.
+
+    Args:
+        passage (Passage): A validated passage. Example `John 3:16-17`
+        bible_versions (list[AcceptedVersion]): versions to compare.
+
+    Returns:
+        tuple[list[int], dict[bible.Version, list[str | None]]]: the verse ids
+        and, per version, the text aligned with them (None if missing).
+    """
+    verse_ids = list(passage.verse_ids())
+
+    # NIV and NEW_INTERNATIONAL are the same version, look it up once.
+    _versions = list(
+        dict.fromkeys(v.pythonbible_version() for v in bible_versions)
+    )
+
+    texts = await asyncio.gather(
+        *(
+            run_in_threadpool(get_verse_texts, verse_ids, _version)
+            for _version in _versions
+        )
+    )
+
+    return verse_ids, dict(zip(_versions, texts))
+
+
 def get_parsed_verse(
     verse: str,
     bible_version: AcceptedVersion = AcceptedVersion.NIV,
@@ -63,6 +132,228 @@ def get_parsed_verse(
     return (book, chapter), verses
 
 
+def check_passage_text(
+    passage: Passage,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> None:
+    """Checks the version has every book of a passage, without reading any
+    text, so responses that leave the text out fail like the ones that
+    include it.
+
+    Args:
+        passage (Passage): A validated passage.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Raises:
+        InvalidVerseError: Raised if the version is missing a book of the
+            passage.
+    """
+    _bible_version = bible_version.pythonbible_version()
+
+    for start, end in passage.ranges:
+        for book_number in range(
+            start // BOOK_PLACE, end // BOOK_PLACE + 1
+        ):
+            if not verse_table.has_book(
+                _bible_version, bible.Book(book_number)
+            ):
+                raise bible.errors.InvalidVerseError("Invalid verse entered")
+
+
+def get_passage_text(
+    passage: Passage,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> tuple[str, ...]:
+    """Gets the text of every verse in a passage.
+
+    The verse ids are read straight from the passage's ranges, one chapter at
+    a time, instead of formatting and re-parsing a reference per segment.
+
+    Args:
+        passage (Passage): A validated passage.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Raises:
+        InvalidVerseError: Raised if the version is missing a book of the
+            passage or has no text for it.
+
+    Returns:
+        tuple[str, ...]: the text of all verses in the passage, a tuple as
+            coalesced callers share it.
+    """
+    check_passage_text(passage, bible_version)
+
+    _bible_version = bible_version.pythonbible_version()
+
+    verses: list[str] = []
+
+    for verse_ids in passage.chapters():
+        text = bible.format_scripture_text(
+            verse_ids,
+            format_type="json",
+            one_verse_per_paragraph=True,
+            version=_bible_version,
+        )
+
+        # Drop the book and chapter lines like get_parsed_verse does.
+        verses.extend(list(filter(lambda x: x != "", text.split("\n")))[2:])
+
+    if not verses:
+        raise bible.errors.InvalidVerseError("Invalid verse entered")
+
+    return tuple(verses)
+
+
+async def get_passage_text_coalesced(
+    passage: Passage,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> tuple[str, ...]:
+    """Same as `get_passage_text` but concurrent identical lookups share
+    one in-flight computation.
+
+    Args:
+        passage (Passage): A validated passage.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Returns:
+        tuple[str, ...]: the text of all verses in the passage.
+    """
+    key = (passage.key, bible_version.pythonbible_version())
+
+    return await verse_flight.do(
+        key, get_passage_text, passage, bible_version
+    )
+
+
+def get_passage_verses(
+    passage: Passage,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> tuple[tuple[int, str], ...]:
+    """Gets the plain text of every verse in a passage with its verse id,
+    for the compact encoders.
+
+    Args:
+        passage (Passage): A validated passage.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Raises:
+        InvalidVerseError: Raised if the version is missing a book of the
+            passage.
+
+    Returns:
+        tuple[tuple[int, str], ...]: verse ids and text, verses missing from
+            the version left out, a tuple as coalesced callers share it.
+    """
+    check_passage_text(passage, bible_version)
+
+    verse_ids = list(passage.verse_ids())
+    texts = get_verse_texts(verse_ids, bible_version.pythonbible_version())
+
+    return tuple(
+        (verse_id, text)
+        for verse_id, text in zip(verse_ids, texts)
+        if text is not None
+    )
+
+
+async def get_passage_verses_coalesced(
+    passage: Passage,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> tuple[tuple[int, str], ...]:
+    """Same as `get_passage_verses` but concurrent identical lookups share
+    one in-flight computation.
+
+    Args:
+        passage (Passage): A validated passage.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Returns:
+        tuple[tuple[int, str], ...]: verse ids and text.
+    """
+    key = ("verses", passage.key, bible_version.pythonbible_version())
+
+    return await verse_flight.do(
+        key, get_passage_verses, passage, bible_version
+    )
+
+
+def read_verse_ids(
+    ordinal: int, limit: int, bible_version: bible.Version
+) -> tuple[list[int], int | None]:
+    """Walks forward through the verses of a version, across chapter and
+    book boundaries, skipping books the version doesn't have.
+
+    The cost depends on limit (and the number of books crossed) only, not on
+    where in the Bible reading starts.
+
+    Args:
+        ordinal (int): position of the first verse to read.
+        limit (int): most verses to read.
+        bible_version (bible.Version): Bible version to read.
+
+    Returns:
+        tuple[list[int], int | None]: the verse ids read and the position of
+        the next verse, None if the end of the version was reached.
+    """
+    verse_ids: list[int] = []
+
+    while ordinal < verse_table.total_verses:
+        verse_id = verse_table.verse_id(ordinal)
+        book = bible.Book(verse_id // BOOK_PLACE)
+        _, book_end = verse_table.book_ordinals(book)
+
+        if not verse_table.has_book(bible_version, book):
+            ordinal = book_end
+            continue
+
+        if len(verse_ids) == limit:
+            return verse_ids, ordinal
+
+        count = min(limit - len(verse_ids), book_end - ordinal)
+        last_verse_id = verse_table.verse_id(ordinal + count - 1)
+
+        verse_ids.extend(verse_table.iter_verse_ids(verse_id, last_verse_id))
+        ordinal += count
+
+    return verse_ids, None
+
+
+def read_verses(
+    ordinal: int,
+    limit: int,
+    bible_version: AcceptedVersion = AcceptedVersion.NIV,
+) -> tuple[list[tuple[int, str | None]], str | None]:
+    """Reads a page of verses starting at a position.
+
+    Args:
+        ordinal (int): position of the first verse to read.
+        limit (int): most verses to read.
+        bible_version (AcceptedVersion, optional): The version of the bible to
+            use. Defaults to `New International Version (NIV)`.
+
+    Returns:
+        tuple[list[tuple[int, str | None]], str | None]: verse ids with their
+        text and the cursor of the next page, None on the last page.
+    """
+    _bible_version = bible_version.pythonbible_version()
+
+    verse_ids, next_ordinal = read_verse_ids(ordinal, limit, _bible_version)
+    texts = get_verse_texts(verse_ids, _bible_version)
+
+    next_cursor = (
+        encode_cursor(_bible_version, next_ordinal)
+        if next_ordinal is not None
+        else None
+    )
+
+    return list(zip(verse_ids, texts)), next_cursor
+
+
 def get_random_verse(
     r_book: str | None = None,
     r_chapter: int | None = None,
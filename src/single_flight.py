@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight computation.
+
+    The first caller for a key runs the function in the threadpool. Callers
+    that arrive with the same key while it is still running await the same
+    result instead of computing it again.
+
+    Every caller gets the very same result object, so functions run through
+    it should return immutable values (tuples, not lists): a change made by
+    one caller would otherwise show up in the others' responses.
+    """
+
+    def __init__(self) -> None:
+        self.__in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+        self.__executions: int = 0
+        self.__coalesced: int = 0
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run `func(*args)` once for all concurrent callers sharing `key`.
+
+        Args:
+            key (Hashable): canonical key identifying the computation.
+            func (Callable[..., Any]): synchronous function to run.
+            *args (Any): arguments passed to func.
+
+        Raises:
+            Exception: whatever func raised, re-raised in every caller.
+
+        Returns:
+            Any: the value returned by func, shared by every caller.
+        """
+        task = self.__in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self.__in_flight[key] = task
+            self.__executions += 1
+            task.add_done_callback(lambda t: self.__done(key, t))
+        else:
+            self.__coalesced += 1
+
+        # Shield so that one cancelled caller (e.g. a client disconnect)
+        # doesn't cancel the computation for everybody else.
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Counters describing how many calls were coalesced.
+
+        Returns:
+            dict[str, int]: total calls, executions, coalesced calls and
+                computations currently in flight.
+        """
+        return {
+            "calls": self.__executions + self.__coalesced,
+            "executions": self.__executions,
+            "coalesced": self.__coalesced,
+            "in_flight": len(self.__in_flight),
+        }
+
+    def __done(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+
+        # Mark the exception as retrieved in case every caller went away.
+        if not task.cancelled():
+            task.exception()
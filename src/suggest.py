@@ -0,0 +1,293 @@
+import re
+from collections import Counter
+
+from pythonbible import Book, Version
+from pythonbible.bible import titles
+
+from src.utils import get_book
+from src.verse_table import verse_table
+
+# Splits a partly typed reference like `john 3:1` into
+#   0 -> Book
+#   1 -> Chapter (optional)
+#   2 -> Verse (optional, may be empty right after the `:`)
+QUERY_REGEX = r"^(.*?[a-z.])\s*(?:(\d+)(?:\s*:\s*(\d*))?)?$"
+
+# Character n-grams used for "did you mean" suggestions
+NGRAM_SIZE = 2
+# Only this much of a misspelled name is looked at, so junk input stays cheap
+MAX_MISSPELLING_LENGTH = 32
+# Least share of n-grams a name must have in common with a misspelling
+MIN_SIMILARITY = 0.3
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name and collapse its whitespace.
+
+    Args:
+        name (str): name to normalize.
+
+    Returns:
+        str: normalized name.
+    """
+    return " ".join(name.split()).lower()
+
+
+def book_names() -> dict[str, tuple[Book, bool]]:
+    """Every name a book can be typed as: its title, its short title in
+    each version and its abbreviations (`jn`, `mt`), with and without the
+    space after a leading number (`1 john`, `1john`).
+
+    Abbreviations have no number, so numbered books get the one from their
+    title (`1 jn`). Only the ones `get_book` resolves to the book are kept,
+    so every suggestion can be looked up.
+
+    Returns:
+        dict[str, tuple[Book, bool]]: normalized name to the book and whether
+            the name is the book's title.
+    """
+    names: dict[str, tuple[Book, bool]] = {}
+
+    for version_titles in titles.SHORT_TITLES.values():
+        for book, short_title in version_titles.items():
+            names.setdefault(normalize_name(short_title), (book, False))
+
+    for book in Book:
+        names[normalize_name(book.title)] = (book, True)
+
+    for book in Book:
+        number = re.match(r"^\d ", book.title)
+
+        for abbreviation in book.abbreviations:
+            name = normalize_name(
+                number.group() + abbreviation if number else abbreviation
+            )
+
+            if get_book(name) is book:
+                names.setdefault(name, (book, False))
+
+    for name, (book, is_title) in list(names.items()):
+        if re.match(r"^\d ", name):
+            names.setdefault(name.replace(" ", "", 1), (book, is_title))
+
+    return names
+
+
+class _Node:
+    __slots__ = ("children", "books")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.books: tuple[Book, ...] = ()
+
+
+class PrefixTrie:
+    """Prefix trie over book names.
+
+    Each node keeps the ranked tuple of books reachable below it, so a lookup
+    is one walk down the prefix and no search of the subtree.
+    """
+
+    def __init__(self, names: dict[str, tuple[Book, bool]]) -> None:
+        self.__root = _Node()
+        self.__names = names
+
+        # Titles rank before other names, then books in canonical order
+        ranks: dict[_Node, dict[Book, tuple[int, int]]] = {}
+
+        for name, (book, is_title) in names.items():
+            rank = (0 if is_title else 1, book.value)
+            node = self.__root
+            path = [node]
+
+            for char in name:
+                node = node.children.setdefault(char, _Node())
+                path.append(node)
+
+            for node in path:
+                _ranks = ranks.setdefault(node, {})
+                _ranks[book] = min(_ranks.get(book, rank), rank)
+
+        for node, _ranks in ranks.items():
+            node.books = tuple(sorted(_ranks, key=_ranks.__getitem__))
+
+    def search(self, prefix: str) -> tuple[Book, ...]:
+        """Books having a name that starts with prefix, best match first.
+
+        Args:
+            prefix (str): normalized prefix.
+
+        Returns:
+            tuple[Book, ...]: matching books.
+        """
+        node = self.__root
+
+        for char in prefix:
+            node = node.children.get(char)  # pyright:ignore[reportAssignmentType]
+
+            if node is None:
+                return ()
+
+        return node.books
+
+    def lookup(self, name: str) -> Book | None:
+        """The book a complete name (or its best completion) refers to.
+
+        Args:
+            name (str): normalized name.
+
+        Returns:
+            Book | None: matching book.
+        """
+        if name in self.__names:
+            return self.__names[name][0]
+
+        books = self.search(name)
+        return books[0] if books else None
+
+
+def ngrams(name: str) -> set[str]:
+    """Character n-grams of a normalized name, padded so that the first and
+    last letters count as much as the others.
+
+    Args:
+        name (str): normalized name.
+
+    Returns:
+        set[str]: n-grams of the name.
+    """
+    padded = " {} ".format(name)
+
+    return {
+        padded[i : i + NGRAM_SIZE]
+        for i in range(len(padded) - NGRAM_SIZE + 1)
+    }
+
+
+class NgramIndex:
+    """Inverted index from character n-grams to book names.
+
+    A misspelled name is scored only against the names sharing at least one
+    n-gram with it, by the share of n-grams they have in common (Dice
+    coefficient), instead of computing an edit distance to every name.
+    """
+
+    def __init__(self, names: dict[str, tuple[Book, bool]]) -> None:
+        self.__books: list[Book] = []
+        self.__sizes: list[int] = []
+        self.__postings: dict[str, list[int]] = {}
+
+        for name, (book, _) in names.items():
+            _ngrams = ngrams(name)
+
+            for ngram in _ngrams:
+                self.__postings.setdefault(ngram, []).append(len(self.__books))
+
+            self.__books.append(book)
+            self.__sizes.append(len(_ngrams))
+
+    def search(self, name: str, limit: int = 3) -> list[Book]:
+        """Books whose names look most like the given one.
+
+        Args:
+            name (str): possibly misspelled book name.
+            limit (int, optional): most books to return. Defaults to 3.
+
+        Returns:
+            list[Book]: closest books, best match first.
+        """
+        _ngrams = ngrams(normalize_name(name)[:MAX_MISSPELLING_LENGTH])
+        shared: Counter[int] = Counter()
+
+        for ngram in _ngrams:
+            shared.update(self.__postings.get(ngram, ()))
+
+        scores: dict[Book, float] = {}
+
+        for index, count in shared.items():
+            score = 2 * count / (len(_ngrams) + self.__sizes[index])
+            book = self.__books[index]
+
+            if score >= MIN_SIMILARITY and score > scores.get(book, 0):
+                scores[book] = score
+
+        return sorted(scores, key=lambda book: -scores[book])[:limit]
+
+
+def numbers_with_prefix(prefix: str, maximum: int, limit: int) -> list[int]:
+    """Numbers from 1 to maximum whose digits start with prefix, smallest
+    first.
+
+    Args:
+        prefix (str): digits typed so far, may be empty.
+        maximum (int): largest allowed number.
+        limit (int): most numbers to return.
+
+    Returns:
+        list[int]: matching numbers.
+    """
+    if not prefix:
+        return list(range(1, min(maximum, limit) + 1))
+
+    numbers: list[int] = []
+    low = high = int(prefix)
+
+    while 0 < low <= maximum and len(numbers) < limit:
+        numbers.extend(
+            range(low, min(high, maximum) + 1)[: limit - len(numbers)]
+        )
+        low, high = low * 10, high * 10 + 9
+
+    return numbers
+
+
+book_trie = PrefixTrie(book_names())
+book_ngrams = NgramIndex(book_names())
+
+
+def suggest_references(
+    query: str, bible_version: Version, limit: int = 10
+) -> list[str]:
+    """Ranked completions for a partly typed reference.
+
+    Book names come from the trie; chapters and verses from the verse
+    count tables.
+
+    Args:
+        query (str): what has been typed so far, eg `jo`, `john 3`, `jn 3:1`
+        bible_version (Version): only suggest books found in this version.
+        limit (int, optional): most suggestions to return. Defaults to 10.
+
+    Returns:
+        list[str]: suggested references.
+    """
+    _query = normalize_name(query)
+    mo = re.search(QUERY_REGEX, _query)
+
+    if not mo or mo.group(2) is None:
+        return [
+            book.title
+            for book in book_trie.search(_query)
+            if verse_table.has_book(bible_version, book)
+        ][:limit]
+
+    name, chapter, verse = mo.groups()
+    book = book_trie.lookup(name.strip())
+
+    if book is None or not verse_table.has_book(bible_version, book):
+        return []
+
+    if verse is None:
+        return [
+            "{} {}".format(book.title, _chapter)
+            for _chapter in numbers_with_prefix(
+                chapter, verse_table.chapter_count(book), limit
+            )
+        ]
+
+    return [
+        "{} {}:{}".format(book.title, chapter, _verse)
+        for _verse in numbers_with_prefix(
+            verse, verse_table.verse_count(book, int(chapter)), limit
+        )
+    ]
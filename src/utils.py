@@ -1,27 +1,34 @@
+import base64
 import random
 import re
 from functools import lru_cache
 
-from pythonbible.bible import titles
 from pythonbible.book_groups import BookGroup
 from pythonbible.books import Book
-from pythonbible.validator import is_valid_chapter
-from pythonbible.verses import MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER
 from pythonbible.versions import Version
 
 from src.exceptions import InvalidArgumentsError
+from src.schemas import AcceptedBookGroup
+from src.verse_table import verse_table
 
 
-@lru_cache
 def get_book(book: str) -> Book | None:
     """Gets a Book with a regex matching book.
 
+    The name is normalized first so that `gen`, `GEN` and ` Gen ` share one
+    cache entry.
+
     Args:
         book (str): name of the book to get.
 
     Returns:
         Book | None: A value from the Book enum or None.
     """
+    return _get_book(" ".join(book.split()).lower())
+
+
+@lru_cache
+def _get_book(book: str) -> Book | None:
     for _book in Book:
         if re.search(
             _book.regular_expression,
@@ -52,11 +59,38 @@ def random_book(
         allowed_books = list(book_group.books)
     else:
         # All books in the given version
-        allowed_books = list(titles.SHORT_TITLES[bible_version].keys())
+        allowed_books = verse_table.books(bible_version)
 
     return random.choice(allowed_books)
 
 
+def plan_books(
+    book_group: AcceptedBookGroup, bible_version: Version
+) -> list[Book]:
+    """Books of a group found in a version, in canonical order.
+
+    Args:
+        book_group (AcceptedBookGroup): group of books to read.
+        bible_version (Version): Bible version to read.
+
+    Returns:
+        list[Book]: books to read.
+    """
+    _book_group = book_group.pythonbible_book_group()
+
+    if _book_group is None:
+        return verse_table.books(bible_version)
+
+    return sorted(
+        (
+            book
+            for book in _book_group.books
+            if verse_table.has_book(bible_version, book)
+        ),
+        key=lambda book: book.value,
+    )
+
+
 def random_chapter_from_book(book: Book) -> int:
     """Gets a random chapter from a book
 
@@ -66,13 +100,7 @@ def random_chapter_from_book(book: Book) -> int:
     Returns:
         int: random chapter from book
     """
-    chapters = MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER.get(book)
-    number_chapters = 0
-
-    if chapters:
-        number_chapters = len(chapters)
-
-    return random.choice(range(1, number_chapters + 1))
+    return random.randint(1, verse_table.chapter_count(book))
 
 
 def random_reference(
@@ -132,20 +160,16 @@ def random_reference(
     else:
         _book = book
 
-        if chapter and not is_valid_chapter(_book, chapter):
+        if chapter and not verse_table.is_valid_chapter(_book, chapter):
             raise InvalidArgumentsError(
                 "chapter {} not in {}".format(chapter, _book.title)
             )
 
         _chapter = chapter  # pyright:ignore[reportAssignmentType]
 
-    chapters = MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER.get(_book)
-    number_verses: int = 1
+    number_verses = verse_table.verse_count(_book, _chapter) or 1
 
-    if chapters:
-        number_verses = chapters[_chapter - 1]
-
-    from_verse = random.choice(range(1, number_verses + 1 - (verse_range - 1)))
+    from_verse = random.randint(1, number_verses - (verse_range - 1))
 
     return (
         "{} {}:{}-{}".format(
@@ -169,6 +193,20 @@ VERSE_REGEX = r"(\d+\s*(-\s*\d+)?)?"
 
 REFERENCE_REGEX = r"^{}\s*{}\s*:?\s*{}".format(BOOK_REGEX, CHAPTER_REGEX, VERSE_REGEX)
 
+# Regexes for matching passages made of several segments, like
+# `Genesis 1:26-2:3` or `John 3:16, 18; Romans 5:8`.
+# Segments are separated by `;` and may leave out the book, in which case
+# the book of the previous segment is used. Each segment is matched as:
+#   0 -> Book (optional)
+#   1 -> Comma separated ranges
+# and each of the comma separated ranges as:
+#   0 -> Start chapter (optional, defaults to the previous chapter)
+#   1 -> Start verse
+#   2 -> End chapter (optional, defaults to the start chapter)
+#   3 -> End verse (optional, defaults to the start verse)
+SEGMENT_REGEX = r"^\s*(\d?\s*[a-zA-Z][a-zA-Z.\s]*?)?\s*(\d[\d\s:,\-]*?)\s*$"
+RANGE_REGEX = r"^(?:(\d+)(?:\s*:\s*|\s+))?(\d+)(?:\s*-\s*(?:(\d+)\s*:\s*)?(\d+))?$"
+
 
 def parse_reference(reference: str) -> tuple[str, int | None, str | None]:
     """Parses a reference, eg `Genesis 1:1-2`, into the book, chapter and verse.
@@ -199,3 +237,122 @@ def parse_reference(reference: str) -> tuple[str, int | None, str | None]:
         book, chapter, verse = reference, None, None
 
     return book, chapter, verse
+
+
+def parse_passage(reference: str) -> list[tuple[str, int, int, int, int]]:
+    """Parses a passage, eg `Genesis 1:26-2:3` or `John 3:16, 18; Romans 5:8`,
+    into its ranges.
+
+    Args:
+        reference (str): The passage to parse.
+
+    Raises:
+        InvalidArgumentsError: Raised if a segment cannot be parsed.
+        InvalidArgumentsError: Raised if the book or chapter of a range cannot
+            be worked out.
+        InvalidArgumentsError: Raised if a chapter is given without a verse.
+
+    Returns:
+        list[tuple[str, int, int, int, int]]: A list of tuples of the book,
+            start chapter, start verse, end chapter and end verse in the order
+            they were given.
+    """
+
+    ranges: list[tuple[str, int, int, int, int]] = []
+    book: str | None = None
+    chapter: int | None = None
+
+    for segment in reference.split(";"):
+        if not segment.strip():
+            continue
+
+        mo = re.search(SEGMENT_REGEX, segment)
+
+        if not mo:
+            raise InvalidArgumentsError(
+                "Cannot parse `{}`".format(segment.strip())
+            )
+
+        _book, _ranges = mo.groups()
+
+        if _book:
+            book, chapter = _book.strip(), None
+        elif book is None:
+            raise InvalidArgumentsError(
+                "Must provide `book` of `{}` to get.".format(segment.strip())
+            )
+
+        for _range in _ranges.split(","):
+            mo = re.search(RANGE_REGEX, _range.strip())
+
+            if not mo:
+                raise InvalidArgumentsError(
+                    "Cannot parse `{}` of `{}`".format(_range.strip(), book)
+                )
+
+            start_chapter, start_verse, end_chapter, end_verse = mo.groups()
+
+            if start_chapter is not None:
+                chapter = int(start_chapter)
+            elif chapter is None:
+                raise InvalidArgumentsError(
+                    "Must provide `verse` of `{} {}` to get.".format(
+                        book, start_verse
+                    )
+                )
+
+            _start_chapter = chapter
+
+            if end_chapter is not None:
+                chapter = int(end_chapter)
+
+            ranges.append(
+                (
+                    book,
+                    _start_chapter,
+                    int(start_verse),
+                    chapter,
+                    int(end_verse or start_verse),
+                )
+            )
+
+    if not ranges:
+        raise InvalidArgumentsError("Cannot parse `{}`".format(reference))
+
+    return ranges
+
+
+def encode_cursor(bible_version: Version, ordinal: int) -> str:
+    """Encodes a reading position into an opaque cursor.
+
+    Args:
+        bible_version (Version): version being read.
+        ordinal (int): position of the next verse to read.
+
+    Returns:
+        str: url safe cursor.
+    """
+    cursor = "{}:{}".format(bible_version.value, ordinal).encode()
+    return base64.urlsafe_b64encode(cursor).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Decodes a cursor made by `encode_cursor`.
+
+    Args:
+        cursor (str): the cursor.
+
+    Raises:
+        InvalidArgumentsError: Raised if the cursor cannot be decoded.
+
+    Returns:
+        tuple[str, int]: the version value and ordinal in the cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        version, ordinal = (
+            base64.urlsafe_b64decode(padded).decode().rsplit(":", 1)
+        )
+        return version, int(ordinal)
+    except ValueError:
+        raise InvalidArgumentsError("Invalid cursor")
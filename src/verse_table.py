@@ -0,0 +1,247 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator
+
+from pythonbible import Book, Version
+from pythonbible.bible import titles
+from pythonbible.verses import MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER
+
+# Verse ids are laid out as BBCCCVVV
+BOOK_PLACE = 1000000
+CHAPTER_PLACE = 1000
+
+
+class VerseTable:
+    """Compact lookup tables for the shape of the Bible.
+
+    Every chapter of every book gets one slot in a flat array of verse counts,
+    `__chapter_start[book]` being the slot of the book's first chapter. A
+    prefix sum over those counts gives each verse a position (ordinal) in
+    the whole Bible, so counting the verses in a range is a subtraction.
+    Which books each version has is kept as one bitset per version.
+    """
+
+    def __init__(self) -> None:
+        books = sorted(
+            MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER, key=lambda b: b.value
+        )
+        size = books[-1].value + 1
+
+        # Indexed by book value
+        self.__chapter_start = array("H", [0] * size)
+        self.__chapter_count = array("H", [0] * size)
+
+        # Indexed by chapter slot
+        self.__chapter_book = array("B")
+        self.__verse_count = array("H")
+        self.__verse_offset = array("I")
+
+        offset = 0
+
+        for book in books:
+            chapters = MAX_VERSE_NUMBER_BY_BOOK_AND_CHAPTER[book]
+
+            self.__chapter_start[book.value] = len(self.__verse_count)
+            self.__chapter_count[book.value] = len(chapters)
+
+            for verses in chapters:
+                self.__chapter_book.append(book.value)
+                self.__verse_count.append(verses)
+                self.__verse_offset.append(offset)
+                offset += verses
+
+        # Sentinel so that the last chapter's end can be read like the others
+        self.__verse_offset.append(offset)
+
+        self.__version_books: dict[Version, int] = {
+            version: sum(1 << book.value for book in version_titles)
+            for version, version_titles in titles.SHORT_TITLES.items()
+        }
+
+    @property
+    def total_verses(self) -> int:
+        return self.__verse_offset[-1]
+
+    def chapter_count(self, book: Book) -> int:
+        """Number of chapters in a book.
+
+        Args:
+            book (Book): a book of the bible.
+
+        Returns:
+            int: number of chapters, 0 if the book is unknown.
+        """
+        if book.value >= len(self.__chapter_count):
+            return 0
+
+        return self.__chapter_count[book.value]
+
+    def verse_count(self, book: Book, chapter: int) -> int:
+        """Number of verses in a chapter of a book.
+
+        Args:
+            book (Book): a book of the bible.
+            chapter (int): chapter of the book.
+
+        Returns:
+            int: number of verses, 0 if the chapter is not in the book.
+        """
+        if not self.is_valid_chapter(book, chapter):
+            return 0
+
+        slot = self.__chapter_start[book.value] + chapter - 1
+        return self.__verse_count[slot]
+
+    def is_valid_chapter(self, book: Book, chapter: int) -> bool:
+        return 1 <= chapter <= self.chapter_count(book)
+
+    def is_valid_verse(self, book: Book, chapter: int, verse: int) -> bool:
+        return 1 <= verse <= self.verse_count(book, chapter)
+
+    def has_book(self, version: Version, book: Book) -> bool:
+        """Check if a version of the bible has a book.
+
+        Args:
+            version (Version): Bible version.
+            book (Book): a book of the bible.
+
+        Returns:
+            bool: True if the book is in the version.
+        """
+        return bool(self.__version_books.get(version, 0) >> book.value & 1)
+
+    def books(self, version: Version) -> list[Book]:
+        """Books of a version of the bible in canonical order.
+
+        Args:
+            version (Version): Bible version.
+
+        Returns:
+            list[Book]: books found in the version.
+        """
+        return [
+            Book(value)
+            for value in range(len(self.__chapter_count))
+            if self.__chapter_count[value]
+            and self.__version_books.get(version, 0) >> value & 1
+        ]
+
+    def ordinal(self, verse_id: int) -> int:
+        """Position of a verse in the whole Bible, starting at 0.
+
+        Args:
+            verse_id (int): a valid verse id.
+
+        Returns:
+            int: ordinal of the verse.
+        """
+        book, chapter, verse = (
+            verse_id // BOOK_PLACE,
+            verse_id % BOOK_PLACE // CHAPTER_PLACE,
+            verse_id % CHAPTER_PLACE,
+        )
+        slot = self.__chapter_start[book] + chapter - 1
+
+        return self.__verse_offset[slot] + verse - 1
+
+    def verse_id(self, ordinal: int) -> int:
+        """Verse id at a position in the whole Bible.
+
+        Args:
+            ordinal (int): position of the verse, starting at 0.
+
+        Returns:
+            int: verse id.
+        """
+        slot = bisect_right(self.__verse_offset, ordinal) - 1
+        verse = ordinal - self.__verse_offset[slot] + 1
+
+        return self.__slot_verse_id(slot, verse)
+
+    def book_ordinals(self, book: Book) -> tuple[int, int]:
+        """Ordinals of the first verse of a book and of the verse just
+        after its last one.
+
+        Args:
+            book (Book): a book of the bible.
+
+        Returns:
+            tuple[int, int]: start (inclusive) and end (exclusive) ordinals.
+        """
+        slot = self.__chapter_start[book.value]
+
+        return (
+            self.__verse_offset[slot],
+            self.__verse_offset[slot + self.__chapter_count[book.value]],
+        )
+
+    def count_verses(self, start: int, end: int) -> int:
+        """Number of verses from start to end (inclusive) without walking
+        them.
+
+        Args:
+            start (int): first verse id.
+            end (int): last verse id.
+
+        Returns:
+            int: number of verses in the range.
+        """
+        return self.ordinal(end) - self.ordinal(start) + 1
+
+    def next_verse_id(self, verse_id: int) -> int | None:
+        """Gets the verse id following the given one in the same book.
+
+        Args:
+            verse_id (int): verse id to start from.
+
+        Returns:
+            int | None: next verse id, or None if verse_id is the last verse
+                of its book.
+        """
+        ordinal = self.ordinal(verse_id) + 1
+
+        if ordinal >= self.total_verses:
+            return None
+
+        following = self.verse_id(ordinal)
+
+        if following // BOOK_PLACE != verse_id // BOOK_PLACE:
+            return None
+
+        return following
+
+    def iter_verse_ids(self, start: int, end: int) -> Iterator[int]:
+        """Walks the verse ids from start to end (inclusive) in reading order.
+
+        Args:
+            start (int): first verse id.
+            end (int): last verse id.
+
+        Yields:
+            int: verse ids.
+        """
+        ordinal, last = self.ordinal(start), self.ordinal(end)
+        slot = bisect_right(self.__verse_offset, ordinal) - 1
+
+        while ordinal <= last:
+            first_verse = ordinal - self.__verse_offset[slot] + 1
+            base = self.__slot_verse_id(slot, 1) - 1
+            verses = min(
+                self.__verse_count[slot],
+                last - self.__verse_offset[slot] + 1,
+            )
+
+            for verse in range(first_verse, verses + 1):
+                yield base + verse
+
+            ordinal = self.__verse_offset[slot + 1]
+            slot += 1
+
+    def __slot_verse_id(self, slot: int, verse: int) -> int:
+        book = self.__chapter_book[slot]
+        chapter = slot - self.__chapter_start[book] + 1
+
+        return book * BOOK_PLACE + chapter * CHAPTER_PLACE + verse
+
+
+verse_table = VerseTable()
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+import src.broadcast
+from src.broadcast import KEEPALIVE, DailyVerseBroadcaster
+from src.schemas import AcceptedVersion, DailyVerse
+
+
+@pytest.fixture
+def days(monkeypatch: pytest.MonkeyPatch) -> list[date]:
+    """Days of the stubbed daily verse, the last one is current."""
+    _days = [date.today()]
+
+    def get_daily_verse(bible_version: AcceptedVersion) -> DailyVerse:
+        return DailyVerse(
+            reference="Day {}".format(len(_days)),
+            verse_text=[],
+            bible_version=bible_version.value,
+            day=_days[-1],
+        )
+
+    monkeypatch.setattr(src.broadcast, "get_daily_verse", get_daily_verse)
+
+    return _days
+
+
+def test_subscribe_sends_current_verse(days: list[date]):
+    async def first_event() -> bytes:
+        broadcaster = DailyVerseBroadcaster()
+        subscriber = broadcaster.subscribe(AcceptedVersion.NIV)
+
+        try:
+            return await anext(subscriber)
+        finally:
+            await subscriber.aclose()
+
+    event = asyncio.run(first_event())
+
+    assert event.startswith(
+        "id: {}\nevent: daily-verse\n".format(days[-1].isoformat()).encode()
+    )
+
+
+def test_publish_while_subscriber_suspended(days: list[date]):
+    async def events() -> list[bytes]:
+        broadcaster = DailyVerseBroadcaster()
+        subscriber = broadcaster.subscribe(AcceptedVersion.NIV)
+
+        try:
+            first = await anext(subscriber)
+
+            # The subscriber is suspended at its `yield`, not waiting yet
+            days.append(days[-1] + timedelta(days=1))
+            await broadcaster.publish()
+
+            second = await asyncio.wait_for(anext(subscriber), 1)
+        finally:
+            await subscriber.aclose()
+
+        return [first, second]
+
+    first, second = asyncio.run(events())
+
+    assert second != KEEPALIVE
+    assert b"Day 2" in second
+    assert b"Day 1" in first
+
+
+def test_publish_wakes_waiting_subscribers(days: list[date]):
+    async def events() -> list[bytes]:
+        broadcaster = DailyVerseBroadcaster()
+        subscribers = [
+            broadcaster.subscribe(AcceptedVersion.NIV) for _ in range(3)
+        ]
+
+        try:
+            for subscriber in subscribers:
+                await anext(subscriber)
+
+            waiting = [
+                asyncio.ensure_future(anext(subscriber))
+                for subscriber in subscribers
+            ]
+            await asyncio.sleep(0)
+
+            days.append(days[-1] + timedelta(days=1))
+            await broadcaster.publish()
+
+            return await asyncio.wait_for(asyncio.gather(*waiting), 1)
+        finally:
+            for subscriber in subscribers:
+                await subscriber.aclose()
+
+    for event in asyncio.run(events()):
+        assert b"Day 2" in event
+
+
+def test_publish_same_day_sends_nothing(days: list[date]):
+    async def stats() -> dict[str, int]:
+        broadcaster = DailyVerseBroadcaster()
+        subscriber = broadcaster.subscribe(AcceptedVersion.NIV)
+
+        try:
+            await anext(subscriber)
+            await broadcaster.publish()
+        finally:
+            await subscriber.aclose()
+
+        return broadcaster.stats()
+
+    assert asyncio.run(stats())["events"] == 1
+
+
+def test_rollover_survives_failed_publish(
+    days: list[date],
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    get_daily_verse = src.broadcast.get_daily_verse
+    failures = [2]
+
+    def failing_get_daily_verse(bible_version: AcceptedVersion) -> DailyVerse:
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("no verse today")
+
+        return get_daily_verse(bible_version)
+
+    monkeypatch.setattr(src.broadcast, "seconds_until_rollover", lambda: 0.01)
+    monkeypatch.setattr(src.broadcast, "ROLLOVER_RETRY_SECONDS", 0.01)
+
+    async def events() -> list[bytes]:
+        broadcaster = DailyVerseBroadcaster()
+        subscriber = broadcaster.subscribe(AcceptedVersion.NIV)
+
+        try:
+            first = await anext(subscriber)
+
+            monkeypatch.setattr(
+                src.broadcast, "get_daily_verse", failing_get_daily_verse
+            )
+            days.append(days[-1] + timedelta(days=1))
+
+            second = await asyncio.wait_for(anext(subscriber), 5)
+        finally:
+            await subscriber.aclose()
+
+        return [first, second]
+
+    first, second = asyncio.run(events())
+
+    assert b"Day 1" in first
+    assert b"Day 2" in second
+    assert failures == [0]
+    assert [
+        record.message
+        for record in caplog.records
+        if record.name == "src.broadcast"
+    ] == ["Daily verse rollover failed, retrying in 0.01 s"] * 2
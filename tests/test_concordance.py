@@ -0,0 +1,127 @@
+import re
+import threading
+import time
+
+import pytest
+from pythonbible import Book, BookGroup, Version
+
+import src.concordance
+from src.concordance import (
+    WORD_REGEX,
+    Concordance,
+    get_concordance,
+    normalize_text,
+)
+from src.verse_table import BOOK_PLACE
+
+
+def words(text: str) -> list[str]:
+    return re.findall(WORD_REGEX, normalize_text(text))
+
+
+def test_words_keep_apostrophes():
+    assert words("the LORD's house") == ["the", "lord's", "house"]
+    assert words("the Lord’s house") == ["the", "lord's", "house"]
+    assert words("‘Go,’ he said") == ["go", "he", "said"]
+
+
+def test_get_concordance_builds_once(monkeypatch: pytest.MonkeyPatch):
+    builds: list[Version] = []
+
+    class SlowConcordance:
+        def __init__(self, bible_version: Version) -> None:
+            builds.append(bible_version)
+            time.sleep(0.2)
+
+    monkeypatch.setattr(src.concordance, "Concordance", SlowConcordance)
+    monkeypatch.setattr(src.concordance, "_concordances", {})
+
+    results: list[object] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                get_concordance(Version.AMERICAN_STANDARD)
+            )
+        )
+        for _ in range(4)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert builds == [Version.AMERICAN_STANDARD]
+    assert len({id(result) for result in results}) == 1
+
+
+def test_get_concordance_builds_versions_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    building = threading.Event()
+    release = threading.Event()
+
+    class BlockingConcordance:
+        def __init__(self, bible_version: Version) -> None:
+            if bible_version is Version.KING_JAMES:
+                building.set()
+                release.wait(5)
+
+    monkeypatch.setattr(src.concordance, "Concordance", BlockingConcordance)
+    monkeypatch.setattr(src.concordance, "_concordances", {})
+
+    thread = threading.Thread(
+        target=lambda: get_concordance(Version.KING_JAMES)
+    )
+    thread.start()
+
+    try:
+        assert building.wait(5)
+
+        # KJV is still being built, ASV doesn't wait for it
+        get_concordance(Version.AMERICAN_STANDARD)
+
+        assert thread.is_alive()
+    finally:
+        release.set()
+        thread.join()
+
+
+@pytest.fixture(scope="module")
+def asv_concordance() -> Concordance:
+    return Concordance(Version.AMERICAN_STANDARD)
+
+
+@pytest.mark.parametrize("word", ["lord's", "jesus", "begat", "selah"])
+@pytest.mark.parametrize(
+    "book_group",
+    [
+        BookGroup.NEW_TESTAMENT_GOSPELS,
+        BookGroup.NEW_TESTAMENT_PAUL_EPISTLES,
+        BookGroup.OLD_TESTAMENT,
+    ],
+)
+def test_top_verses_in_books(
+    asv_concordance: Concordance, word: str, book_group: BookGroup
+):
+    everywhere = asv_concordance.top_verses(word, limit=100_000)
+    books = set(book_group.books)
+    book_values = {book.value for book in books}
+
+    assert everywhere == sorted(
+        everywhere, key=lambda verse: (-verse[1], verse[0])
+    )
+    assert sum(count for _, count in everywhere) == sum(
+        asv_concordance.book_counts(word).values()
+    )
+    assert asv_concordance.top_verses(word, books, 10) == [
+        verse
+        for verse in everywhere
+        if verse[0] // BOOK_PLACE in book_values
+    ][:10]
+
+
+def test_top_verses_unknown_word(asv_concordance: Concordance):
+    assert asv_concordance.top_verses("xyzzy") == []
+    assert asv_concordance.top_verses("selah", {Book.JOHN}) == []
@@ -0,0 +1,90 @@
+import pytest
+from pythonbible import Book
+from pythonbible.errors import InvalidVerseError
+
+from src.encoders import (
+    ResponseFormat,
+    compact_verse_payload,
+    encode,
+    negotiate,
+    select_fields,
+)
+from src.passages import Passage
+from src.schemas import AcceptedBookGroup, AcceptedVersion
+from src.service import check_passage_text
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, ResponseFormat.JSON),
+        ("", ResponseFormat.JSON),
+        ("*/*", ResponseFormat.JSON),
+        ("text/html", ResponseFormat.JSON),
+        (
+            "application/vnd.bible.compact+json",
+            ResponseFormat.COMPACT_JSON,
+        ),
+        (
+            "application/json;q=0.5, application/vnd.bible.compact+json",
+            ResponseFormat.COMPACT_JSON,
+        ),
+        (
+            "application/vnd.bible.compact+json;q=0, application/json",
+            ResponseFormat.JSON,
+        ),
+    ],
+)
+def test_negotiate(accept: str | None, expected: ResponseFormat):
+    assert negotiate(accept) is expected
+
+
+def test_negotiate_msgpack():
+    if msgpack is None:
+        assert negotiate("application/msgpack") is None
+        assert (
+            negotiate("application/msgpack, application/json;q=0.1")
+            is ResponseFormat.JSON
+        )
+    else:
+        assert negotiate("application/x-msgpack") is ResponseFormat.MSGPACK
+
+
+def test_select_fields():
+    payload = {"reference": "John 3:16", "verse_text": ["16. For God"]}
+
+    assert select_fields(payload, None) == payload
+    assert select_fields(payload, ["reference"]) == {"reference": "John 3:16"}
+
+
+def test_compact_verse_payload():
+    payload = compact_verse_payload(
+        "John 3:16",
+        [(43003016, "For God")],
+        AcceptedBookGroup.ANY,
+        AcceptedVersion.NIV,
+    )
+
+    assert payload == {
+        "reference": "John 3:16",
+        "book_group": "Any",
+        "bible_version": "NIV",
+        "verse_text": [[43003016, "For God"]],
+    }
+    assert encode(payload, ResponseFormat.COMPACT_JSON).startswith(
+        b'{"reference":"John 3:16",'
+    )
+
+
+def test_check_passage_text():
+    check_passage_text(Passage([(43003016, 43003016)]), AcceptedVersion.ASV)
+
+    tobit = Book.TOBIT.value * 1000000 + 1001
+
+    with pytest.raises(InvalidVerseError):
+        check_passage_text(Passage([(tobit, tobit)]), AcceptedVersion.ASV)
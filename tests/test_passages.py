@@ -0,0 +1,157 @@
+import pytest
+from fastapi import HTTPException
+
+from src.constants import MAX_PASSAGE_VERSES
+from src.dependencies import validate_passage
+from src.exceptions import InvalidArgumentsError
+from src.passages import Passage, merge_verse_ranges
+from src.utils import parse_passage
+
+
+@pytest.mark.parametrize(
+    "reference, expected",
+    [
+        ("John 3:16", [("John", 3, 16, 3, 16)]),
+        ("John 3:16-18", [("John", 3, 16, 3, 18)]),
+        ("Genesis 1:26-2:3", [("Genesis", 1, 26, 2, 3)]),
+        (
+            "John 3:16, 18; Romans 5:8",
+            [("John", 3, 16, 3, 16), ("John", 3, 18, 3, 18),
+             ("Romans", 5, 8, 5, 8)],
+        ),
+        (
+            "John 3:16, 4:1-2, 5",
+            [("John", 3, 16, 3, 16), ("John", 4, 1, 4, 2),
+             ("John", 4, 5, 4, 5)],
+        ),
+        ("1 John 4:7-8", [("1 John", 4, 7, 4, 8)]),
+    ],
+)
+def test_parse_passage(
+    reference: str, expected: list[tuple[str, int, int, int, int]]
+):
+    assert parse_passage(reference) == expected
+
+
+@pytest.mark.parametrize("reference", ["", ";", "John", "John 3", "3:16"])
+def test_parse_passage_invalid(reference: str):
+    with pytest.raises(InvalidArgumentsError):
+        parse_passage(reference)
+
+
+@pytest.mark.parametrize(
+    "ranges, expected",
+    [
+        # Overlapping
+        (
+            [(43003016, 43003018), (43003017, 43003020)],
+            ((43003016, 43003020),),
+        ),
+        # Contained, and given out of order
+        (
+            [(43003010, 43003020), (43003012, 43003014)],
+            ((43003010, 43003020),),
+        ),
+        (
+            [(45005008, 45005008), (43003016, 43003016)],
+            ((43003016, 43003016), (45005008, 45005008)),
+        ),
+        # Adjacent in a chapter
+        (
+            [(43003016, 43003016), (43003017, 43003017)],
+            ((43003016, 43003017),),
+        ),
+        # Adjacent across chapters: John 3:36 is the last verse of John 3
+        (
+            [(43003030, 43003036), (43004001, 43004002)],
+            ((43003030, 43004002),),
+        ),
+        # Not adjacent
+        (
+            [(43003016, 43003016), (43003018, 43003018)],
+            ((43003016, 43003016), (43003018, 43003018)),
+        ),
+        # The last verse of a book doesn't touch the next book
+        (
+            [(43021025, 43021025), (44001001, 44001001)],
+            ((43021025, 43021025), (44001001, 44001001)),
+        ),
+    ],
+)
+def test_merge_verse_ranges(
+    ranges: list[tuple[int, int]], expected: tuple[tuple[int, int], ...]
+):
+    assert merge_verse_ranges(ranges) == expected
+
+
+def test_passage_reference_and_key():
+    passage = Passage(
+        [(45005008, 45005008), (43003018, 43003018), (43003016, 43003016)]
+    )
+
+    assert passage.reference == "John 3:16, 18; Romans 5:8"
+    assert passage.key == "43003016,43003018,45005008"
+    assert passage.verse_count == 3
+
+
+def test_passage_cross_chapter():
+    passage = Passage([(1001026, 1002003)])
+
+    assert passage.reference == "Genesis 1:26-2:3"
+    assert passage.verse_count == 9
+    assert [len(chapter) for chapter in passage.chapters()] == [6, 3]
+
+
+def test_validate_passage_same_key_for_every_spelling():
+    keys = {
+        validate_passage(reference).key
+        for reference in [
+            "John 3:16-18",
+            "john 3:16-17, 18",
+            "Jn 3:18, 16-17",
+            "John 3:16; John 3:17-18",
+        ]
+    }
+
+    assert keys == {"43003016-43003018"}
+
+
+def test_validate_passage_cross_chapter():
+    passage = validate_passage("Genesis 1:26-2:3")
+
+    assert passage.ranges == ((1001026, 1002003),)
+
+
+@pytest.mark.parametrize(
+    "reference",
+    [
+        "John 3:0",
+        "John 3:37",
+        "John 22:1",
+        "John 3:18-16",
+        "Genesis 2:3-1:26",
+        "Nobook 1:1",
+    ],
+)
+def test_validate_passage_invalid(reference: str):
+    with pytest.raises(HTTPException) as e:
+        validate_passage(reference)
+
+    assert e.value.status_code == 400
+
+
+def test_validate_passage_verse_cap():
+    # Psalm 119 has 176 verses, Psalm 118 has 29
+    assert validate_passage("Psalm 118:6-119:176").verse_count == (
+        MAX_PASSAGE_VERSES
+    )
+
+    with pytest.raises(HTTPException) as e:
+        validate_passage("Psalm 118:5-119:176")
+
+    assert e.value.status_code == 400
+
+    # Overlapping segments are only counted once
+    assert validate_passage(
+        "Psalm 118:6-119:176; Psalm 119:1-10"
+    ).verse_count == MAX_PASSAGE_VERSES
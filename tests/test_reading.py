@@ -0,0 +1,167 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+from pythonbible import Book, Version
+
+from src.dependencies import validate_read_start
+from src.exceptions import InvalidArgumentsError
+from src.schemas import AcceptedVersion
+from src.service import read_verse_ids
+from src.utils import decode_cursor, encode_cursor
+from src.verse_table import BOOK_PLACE, verse_table
+
+
+@pytest.mark.parametrize("ordinal", [0, 1, 26_000, 31_101])
+def test_cursor_round_trip(ordinal: int):
+    cursor = encode_cursor(Version.AMERICAN_STANDARD, ordinal)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (Version.AMERICAN_STANDARD.value, ordinal)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "!!!",
+        "a",
+        base64.urlsafe_b64encode(b"ASV").decode(),
+        base64.urlsafe_b64encode(b"ASV:ten").decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe:1").decode(),
+    ],
+)
+def test_decode_cursor_invalid(cursor: str):
+    with pytest.raises(InvalidArgumentsError):
+        decode_cursor(cursor)
+
+
+def test_validate_read_start_cursor():
+    cursor = encode_cursor(Version.AMERICAN_STANDARD, 100)
+
+    assert validate_read_start(
+        cursor=cursor, bible_version=AcceptedVersion.ASV
+    ) == 100
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "!!!",
+        encode_cursor(Version.AMERICAN_STANDARD, -1),
+        encode_cursor(Version.AMERICAN_STANDARD, verse_table.total_verses),
+    ],
+)
+def test_validate_read_start_invalid_cursor(cursor: str):
+    with pytest.raises(HTTPException) as e:
+        validate_read_start(cursor=cursor, bible_version=AcceptedVersion.ASV)
+
+    assert e.value.status_code == 400
+    assert e.value.detail == "Invalid cursor"
+
+
+def test_validate_read_start_cursor_for_other_version():
+    cursor = encode_cursor(Version.KING_JAMES, 100)
+
+    with pytest.raises(HTTPException) as e:
+        validate_read_start(cursor=cursor, bible_version=AcceptedVersion.ASV)
+
+    assert e.value.status_code == 400
+    assert e.value.detail == "cursor is not for {}".format(
+        Version.AMERICAN_STANDARD.title
+    )
+
+
+def test_read_verse_ids_across_chapters():
+    verse_ids, ordinal = read_verse_ids(
+        verse_table.ordinal(43003035), 3, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [43003035, 43003036, 43004001]
+    assert ordinal == verse_table.ordinal(43004002)
+
+
+def test_read_verse_ids_across_books():
+    verse_ids, ordinal = read_verse_ids(
+        verse_table.ordinal(43021024), 4, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [43021024, 43021025, 44001001, 44001002]
+    assert ordinal == verse_table.ordinal(44001003)
+
+
+def test_read_verse_ids_pages_join_up():
+    start = verse_table.ordinal(43021020)
+    verse_ids, _ = read_verse_ids(start, 20, Version.AMERICAN_STANDARD)
+
+    pages: list[int] = []
+    ordinal: int | None = start
+
+    while ordinal is not None and len(pages) < 20:
+        page, ordinal = read_verse_ids(ordinal, 3, Version.AMERICAN_STANDARD)
+        pages.extend(page)
+
+    assert pages[:20] == verse_ids
+
+
+def test_read_verse_ids_skips_missing_books(monkeypatch: pytest.MonkeyPatch):
+    has_book = verse_table.has_book
+
+    monkeypatch.setattr(
+        verse_table,
+        "has_book",
+        lambda version, book: book != Book.ACTS and has_book(version, book),
+    )
+
+    verse_ids, ordinal = read_verse_ids(
+        verse_table.ordinal(43021025), 2, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [43021025, 45001001]
+    assert ordinal == verse_table.ordinal(45001002)
+
+
+def test_read_verse_ids_skips_missing_first_book(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    has_book = verse_table.has_book
+
+    monkeypatch.setattr(
+        verse_table,
+        "has_book",
+        lambda version, book: book != Book.ACTS and has_book(version, book),
+    )
+
+    verse_ids, _ = read_verse_ids(
+        verse_table.ordinal(44001001), 1, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [45001001]
+
+
+def test_read_verse_ids_end_of_version():
+    # Revelation 22:21, the books after it are not in the ASV
+    verse_ids, ordinal = read_verse_ids(
+        verse_table.ordinal(66022020), 5, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [66022020, 66022021]
+    assert ordinal is None
+
+
+def test_read_verse_ids_page_ending_at_end_of_version():
+    verse_ids, ordinal = read_verse_ids(
+        verse_table.ordinal(66022021), 1, Version.AMERICAN_STANDARD
+    )
+
+    assert verse_ids == [66022021]
+    assert ordinal is None
+
+
+def test_read_verse_ids_past_end_of_version():
+    last = verse_table.total_verses - 1
+
+    book = Book(verse_table.verse_id(last) // BOOK_PLACE)
+
+    assert not verse_table.has_book(Version.AMERICAN_STANDARD, book)
+    assert read_verse_ids(last, 5, Version.AMERICAN_STANDARD) == ([], None)
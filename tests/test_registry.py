@@ -0,0 +1,134 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+import src.registry
+from src.registry import LocalVersion, VersionRegistry
+
+GOOD = (
+    '{"title": "Good"}\n'
+    '{"verse_id": 43003016, "text": "For God so loved the world"}\n'
+    '{"verse_id": 43003017, "text": null}\n'
+    '{"verse_id": 43003018, "text": "He that believeth"}\n'
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    (tmp_path / "GOOD.jsonl").write_text(GOOD)
+    (tmp_path / "BADHEADER.jsonl").write_text("not json\n")
+    (tmp_path / "NOTITLE.jsonl").write_text('{"name": "No title"}\n')
+    (tmp_path / "BADLINE.jsonl").write_text(
+        '{"title": "Bad line"}\n{"verse_id": 43003016}\n'
+    )
+    (tmp_path / "BADJSON.jsonl").write_text('{"title": "Bad json"}\n{oops\n')
+    (tmp_path / "BADVERSE.jsonl").write_text(
+        '{"title": "Bad verse"}\n{"verse_id": 43099001, "text": "x"}\n'
+    )
+
+    return tmp_path
+
+
+def test_get(data_dir: Path):
+    registry = VersionRegistry(data_dir, 1024 * 1024)
+    version = registry.get("good")
+
+    assert version is not None
+    assert version.title == "Good"
+    assert version.verse_texts(43003016, 43003018) == [
+        (43003016, "For God so loved the world"),
+        (43003018, "He that believeth"),
+    ]
+    assert registry.get("GOOD") is version
+    assert registry.get("missing") is None
+
+
+@pytest.mark.parametrize(
+    "version_id", ["BADHEADER", "NOTITLE", "BADLINE", "BADJSON", "BADVERSE"]
+)
+def test_get_invalid_file(data_dir: Path, version_id: str):
+    registry = VersionRegistry(data_dir, 1024 * 1024)
+
+    assert registry.get(version_id) is None
+    assert registry.stats()["loaded"] == []
+
+
+def test_versions_skips_invalid_headers(data_dir: Path):
+    registry = VersionRegistry(data_dir, 1024 * 1024)
+    registry.get("GOOD")
+
+    assert registry.versions() == [
+        ("BADJSON", "Bad json", False),
+        ("BADLINE", "Bad line", False),
+        ("BADVERSE", "Bad verse", False),
+        ("GOOD", "Good", True),
+    ]
+
+
+def test_evicts_least_recently_used(tmp_path: Path):
+    for version_id in ("A", "B", "C"):
+        (tmp_path / "{}.jsonl".format(version_id)).write_text(GOOD)
+
+    size = LocalVersion("A", tmp_path / "A.jsonl").nbytes
+    registry = VersionRegistry(tmp_path, 2 * size)
+
+    registry.get("A")
+    registry.get("B")
+    registry.get("A")
+    registry.get("C")
+
+    stats = registry.stats()
+
+    assert stats["loaded"] == ["A", "C"]
+    assert stats["evictions"] == 1
+
+
+def test_load_does_not_block_other_versions(
+    data_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    registry = VersionRegistry(data_dir, 1024 * 1024)
+    registry.get("GOOD")
+
+    (data_dir / "SLOW.jsonl").write_text(GOOD)
+    (data_dir / "OTHER.jsonl").write_text(GOOD)
+    loads: list[str] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowVersion(LocalVersion):
+        def __init__(self, version_id: str, path: Path) -> None:
+            loads.append(version_id)
+
+            if version_id == "SLOW":
+                started.set()
+                release.wait(5)
+
+            super().__init__(version_id, path)
+
+    monkeypatch.setattr(src.registry, "LocalVersion", SlowVersion)
+
+    threads = [
+        threading.Thread(target=registry.get, args=("SLOW",))
+        for _ in range(4)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        assert started.wait(5)
+
+        # SLOW is still being read, other versions don't wait for it
+        assert registry.get("GOOD") is not None
+        assert registry.get("OTHER") is not None
+        assert all(thread.is_alive() for thread in threads)
+    finally:
+        release.set()
+
+        for thread in threads:
+            thread.join()
+
+    assert loads == ["SLOW", "OTHER"]
+    assert sorted(registry.stats()["loaded"]) == ["GOOD", "OTHER", "SLOW"]
+    assert registry.stats()["loads"] == 3
@@ -0,0 +1,95 @@
+import asyncio
+import gc
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from src.runtime_metrics import RuntimeMiddleware, RuntimeMonitor, percentile
+
+
+@pytest.fixture
+def monitor() -> Iterator[RuntimeMonitor]:
+    callbacks = list(gc.callbacks)
+    monitor = RuntimeMonitor()
+
+    yield monitor
+
+    monitor.stop()
+    assert gc.callbacks == callbacks
+
+
+async def ignore(message: dict[str, Any]) -> None:
+    pass
+
+
+def respond(
+    monitor: RuntimeMonitor, media_type: bytes, during: list[dict[str, int]]
+):
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", media_type)],
+            }
+        )
+        during.append(monitor.snapshot()["requests"])
+
+    return app
+
+
+def test_event_streams_are_not_in_flight(monitor: RuntimeMonitor):
+    during: list[dict[str, int]] = []
+    app = RuntimeMiddleware(
+        respond(monitor, b"text/event-stream", during), monitor
+    )
+
+    asyncio.run(app({"type": "http"}, None, ignore))
+
+    assert during[0]["in_flight"] == 0
+    assert during[0]["streams"] == 1
+    assert monitor.snapshot()["requests"]["streams"] == 0
+
+
+def test_requests_in_flight(monitor: RuntimeMonitor):
+    during: list[dict[str, int]] = []
+    app = RuntimeMiddleware(
+        respond(monitor, b"application/json", during), monitor
+    )
+
+    asyncio.run(app({"type": "http"}, None, ignore))
+
+    assert during[0]["in_flight"] == 1
+    assert during[0]["streams"] == 0
+    assert monitor.snapshot()["requests"] == {
+        "in_flight": 0,
+        "max_in_flight": 1,
+        "streams": 0,
+    }
+
+
+def test_stop(monitor: RuntimeMonitor):
+    async def run() -> None:
+        callbacks = len(gc.callbacks)
+
+        monitor.start()
+        assert len(gc.callbacks) == callbacks + 1
+
+        gc.collect()
+        collections = monitor.snapshot()["gc"]["collections"]
+        assert collections[2] >= 1
+
+        monitor.stop()
+        assert len(gc.callbacks) == callbacks
+
+        gc.collect()
+        assert monitor.snapshot()["gc"]["collections"] == collections
+
+    asyncio.run(run())
+
+
+def test_percentile():
+    assert percentile([], 0.99) == 0
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile([float(i) for i in range(1, 101)], 0.99) == 99
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from src.dependencies import validate_passage
+from src.schemas import AcceptedVersion
+from src.service import get_passage_text_coalesced, get_passage_verses
+from src.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    release = threading.Event()
+    calls: list[int] = []
+
+    def compute(value: int) -> tuple[int, ...]:
+        calls.append(value)
+        release.wait(5)
+        return (value,)
+
+    async def run() -> list[tuple[int, ...]]:
+        flight = SingleFlight()
+        callers = [
+            asyncio.ensure_future(flight.do("key", compute, 1))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+
+        results = await asyncio.gather(*callers)
+
+        assert flight.stats() == {
+            "calls": 3,
+            "executions": 1,
+            "coalesced": 2,
+            "in_flight": 0,
+        }
+
+        return results
+
+    results = asyncio.run(run())
+
+    assert calls == [1]
+    assert results == [(1,)] * 3
+
+
+def test_shared_passage_results_are_immutable():
+    passage = validate_passage("John 3:16-18")
+
+    async def run() -> list[tuple[str, ...]]:
+        return await asyncio.gather(
+            *(
+                get_passage_text_coalesced(passage, AcceptedVersion.ASV)
+                for _ in range(3)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, tuple) for result in results)
+    assert len(results[0]) == 3
+    assert isinstance(get_passage_verses(passage, AcceptedVersion.ASV), tuple)
@@ -0,0 +1,40 @@
+import pytest
+from pythonbible import Book, Version
+
+from src.suggest import book_names, suggest_references
+from src.utils import get_book
+
+
+def test_book_names_resolve_to_their_book():
+    for name, (book, _) in book_names().items():
+        assert get_book(name) is book, name
+
+
+@pytest.mark.parametrize(
+    "name, book",
+    [
+        ("jn", Book.JOHN),
+        ("1 jn", Book.JOHN_1),
+        ("1jn", Book.JOHN_1),
+        ("ps", Book.PSALMS),
+        ("phm", Book.PHILEMON),
+    ],
+)
+def test_book_names_have_abbreviations(name: str, book: Book):
+    assert book_names()[name][0] is book
+
+
+def test_suggest_abbreviation_with_chapter():
+    suggestions = suggest_references("jn 3:", Version.AMERICAN_STANDARD)
+
+    assert suggestions[:2] == ["John 3:1", "John 3:2"]
+
+
+def test_suggest_numbered_abbreviation():
+    suggestions = suggest_references("1 jn 1:", Version.AMERICAN_STANDARD)
+
+    assert suggestions[0] == "1 John 1:1"
+
+
+def test_suggest_prefers_titles():
+    assert suggest_references("joh", Version.AMERICAN_STANDARD)[0] == "John"